@@ -9,6 +9,7 @@ from PyQt5.QtCore import QRegularExpression, QLocale
 
 from funko_pop import FunkoPop 
 from funko_db import FunkoDB
+from image_store import ImageStore
 
 # Dialog for adding a new Funko Pop item
 class AddItemDialog(QDialog):
@@ -127,6 +128,17 @@ class AddItemDialog(QDialog):
             QMessageBox.warning(self, "Internal Error", "Could not process market value.")
             return
 
+        # Copy the photo into the app's image store so display never reads the original again
+        image_hash = None
+        stored_path = self.image_path
+        if self.image_path:
+            try:
+                image_hash = ImageStore.store(self.image_path)
+                stored_path = ImageStore.original_path(image_hash)
+            except (OSError, ValueError) as e:
+                QMessageBox.warning(self, "Image Error", f"Could not read the selected image:\n{e}")
+                return
+
         # 2. Create the FunkoPop object
         self.new_pop = FunkoPop(
             barcode=barcode,
@@ -135,7 +147,8 @@ class AddItemDialog(QDialog):
             item_number=item_no,
             market_value=market_value,
             year=release_year,
-            image_path=self.image_path
+            image_path=stored_path,
+            image_hash=image_hash
         )
 
         # Save the new pop to funko_pops.db and update its ID
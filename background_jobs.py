@@ -0,0 +1,100 @@
+import threading, traceback
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from db_connection import ConnectionManager
+
+# Raised inside a job's progress callback once the job has been cancelled
+class JobCancelled(Exception):
+    pass
+
+
+# One named job on the pool. The wrapped function receives a `progress`
+# keyword argument: progress(done, total) reports progress (total=0 when
+# unknown) and raises JobCancelled if the job was cancelled meanwhile.
+# Jobs must not call it after their final commit, or a late cancel would be
+# reported as "cancelled" for work that was kept.
+class _Job(QRunnable):
+    def __init__(self, runner, name, func, args, kwargs):
+        super().__init__()
+        self.runner = runner
+        self.name = name
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.cancel_event = threading.Event()
+
+    def report(self, done, total=0):
+        if self.cancel_event.is_set():
+            raise JobCancelled(self.name)
+        self.runner.progress.emit(self.name, int(done), int(total))
+
+    def run(self):
+        try:
+            result = self.func(*self.args, progress=self.report, **self.kwargs)
+        except JobCancelled:
+            self.runner._done.emit(self.name, "cancelled", None)
+        except Exception as e:
+            traceback.print_exc()
+            self.runner._done.emit(self.name, "failed", str(e))
+        else:
+            self.runner._done.emit(self.name, "finished", result)
+        finally:
+            # Pool threads are reused; don't keep this job's SQLite connections around
+            ConnectionManager.close_thread_connections()
+
+
+# Runs DB and network jobs off the GUI thread. Each job is known by name and
+# only one job per name may run at a time. All signals arrive on the GUI thread.
+class JobRunner(QObject):
+    started = pyqtSignal(str)
+    progress = pyqtSignal(str, int, int)     # name, done, total (0 = unknown)
+    finished = pyqtSignal(str, object)       # name, return value
+    failed = pyqtSignal(str, str)            # name, error message
+    cancelled = pyqtSignal(str)
+
+    _done = pyqtSignal(str, str, object)     # internal: name, outcome, payload
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._pool = QThreadPool(self)
+        self._jobs = {}
+        self._done.connect(self._on_done)
+
+    def start(self, name, func, *args, **kwargs) -> bool:
+        """Queue func(*args, progress=..., **kwargs). Returns False if `name` is already running."""
+        if name in self._jobs:
+            print(f"Job '{name}' is already running")
+            return False
+        job = _Job(self, name, func, args, kwargs)
+        self._jobs[name] = job
+        self.started.emit(name)
+        self._pool.start(job)
+        return True
+
+    def cancel(self, name):
+        job = self._jobs.get(name)
+        if job is not None:
+            job.cancel_event.set()
+
+    def cancel_all(self):
+        for job in self._jobs.values():
+            job.cancel_event.set()
+
+    def is_running(self, name) -> bool:
+        return name in self._jobs
+
+    def running_jobs(self):
+        return list(self._jobs)
+
+    def wait(self, msecs=-1) -> bool:
+        return self._pool.waitForDone(msecs)
+
+    def _on_done(self, name, outcome, payload):
+        self._jobs.pop(name, None)
+        if outcome == "finished":
+            self.finished.emit(name, payload)
+        elif outcome == "failed":
+            self.failed.emit(name, payload)
+        else:
+            self.cancelled.emit(name)
@@ -0,0 +1,164 @@
+# Benchmark for the SQLite layer: add/update/delete throughput of the personal
+# collection, comparing the old connect-per-call pattern with the shared
+# ConnectionManager, plus catalog upsert throughput (per-row vs upsert_many).
+# Runs against throwaway databases in a temp directory.
+#
+#   python bench_db.py [rows] [catalog_rows]
+
+import os, sys, sqlite3, tempfile, time
+
+from funko_pop import FunkoPop
+from funko_db import FunkoDB
+from firebase_db import FirebaseDB
+from db_connection import ConnectionManager
+
+INSERT_SQL = """
+INSERT INTO funko_pops (barcode, name, series, item_number, market_value, year, image_path)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+UPDATE_SQL = "UPDATE funko_pops SET market_value=? WHERE id=?"
+DELETE_SQL = "DELETE FROM funko_pops WHERE id=?"
+
+
+def make_funkos(count):
+    funkos = []
+    for i in range(count):
+        funko = FunkoPop.from_basic(str(100000000 + i), f"Pop {i}", "Bench", str(i))
+        funko.market_value = float(i % 500)
+        funko.year = str(2000 + i % 25)
+        funkos.append(funko)
+    return funkos
+
+
+def bench_legacy(db_path, funkos):
+    """The pre-ConnectionManager pattern: connect, execute, commit per call."""
+    def run(sql, params):
+        with sqlite3.connect(db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute(sql, params)
+            conn.commit()
+            return cursor.lastrowid
+
+    results = {}
+    start = time.perf_counter()
+    ids = [run(INSERT_SQL, (f.barcode, f.name, f.series, f.item_number,
+                            f.market_value, f.year, f.image_path)) for f in funkos]
+    results["add"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for funko_id in ids:
+        run(UPDATE_SQL, (1.0, funko_id))
+    results["update"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for funko_id in ids:
+        run(DELETE_SQL, (funko_id,))
+    results["delete"] = time.perf_counter() - start
+    return results
+
+
+def bench_managed(funkos):
+    """The current FunkoDB static API on top of ConnectionManager."""
+    results = {}
+    start = time.perf_counter()
+    for funko in funkos:
+        funko.id = FunkoDB.add_funko(funko)
+    results["add"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for funko in funkos:
+        funko.market_value = 1.0
+        FunkoDB.update_funko(funko)
+    results["update"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for funko in funkos:
+        FunkoDB.delete_funko(funko.id)
+    results["delete"] = time.perf_counter() - start
+    return results
+
+
+def bench_bulk(funkos):
+    """The batch API: one transaction per operation over the whole set."""
+    results = {}
+    start = time.perf_counter()
+    ids = FunkoDB.add_funkos(funkos)
+    results["add"] = time.perf_counter() - start
+
+    for funko, funko_id in zip(funkos, ids):
+        funko.id = funko_id
+        funko.market_value = 2.0
+    start = time.perf_counter()
+    FunkoDB.update_funkos(funkos)
+    results["update"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    FunkoDB.delete_funkos(ids)
+    results["delete"] = time.perf_counter() - start
+    return results
+
+
+def bench_catalog(count):
+    """Catalog refresh: FirebaseDB.upsert_funko per row vs one upsert_many."""
+    rows = [(str(100000000 + i), f"Pop {i}", float(i % 500), str(2000 + i % 25)) for i in range(count)]
+    results = {}
+
+    # The per-row path is far slower; time a slice of it and extrapolate
+    sample = rows[:min(count, 5000)]
+    start = time.perf_counter()
+    for barcode, name, market_value, year in sample:
+        FirebaseDB.upsert_funko(barcode, name, market_value, year)
+    results["per-row"] = (time.perf_counter() - start) * count / len(sample)
+
+    start = time.perf_counter()
+    FirebaseDB.upsert_many(iter(rows))
+    results["upsert_many"] = time.perf_counter() - start
+    return results
+
+
+def report(label, results, count):
+    for op in ("add", "update", "delete"):
+        elapsed = results[op]
+        print(f"{label:<10} {op:<7} {count / elapsed:>12,.0f} rows/sec  ({elapsed:.3f}s)")
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    catalog_count = int(sys.argv[2]) if len(sys.argv) > 2 else 100000
+    funkos = make_funkos(count)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        FunkoDB.DB_PATH = os.path.join(tmp, "legacy.db")
+        FunkoDB.migrate()
+        ConnectionManager.close_all()
+        # Start the legacy run from a rollback-journal database, as before
+        with sqlite3.connect(FunkoDB.DB_PATH) as conn:
+            conn.execute("PRAGMA journal_mode=DELETE")
+        legacy = bench_legacy(FunkoDB.DB_PATH, funkos)
+
+        FunkoDB.DB_PATH = os.path.join(tmp, "managed.db")
+        FunkoDB.migrate()
+
+        # The FunkoDB methods print on every call; keep that out of the timings
+        stdout = sys.stdout
+        sys.stdout = open(os.devnull, "w")
+        try:
+            managed = bench_managed(funkos)
+            bulk = bench_bulk(funkos)
+
+            FirebaseDB.URL = os.path.join(tmp, "catalog.db")
+            FirebaseDB.create_table()
+            catalog = bench_catalog(catalog_count)
+        finally:
+            sys.stdout.close()
+            sys.stdout = stdout
+        ConnectionManager.close_all()
+
+    print(f"{count} rows")
+    report("legacy", legacy, count)
+    report("managed", managed, count)
+    report("bulk", bulk, count)
+
+    print(f"{catalog_count} catalog rows")
+    for label, elapsed in catalog.items():
+        print(f"{label:<18} {catalog_count / elapsed:>12,.0f} rows/sec  ({elapsed:.3f}s)")
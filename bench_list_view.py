@@ -0,0 +1,109 @@
+# Benchmark for the collection grid: lays out N pops in the QListView set up
+# like Home's (IconMode, Adjust, Batched, uniform 220x150 tiles painted by
+# PopTileDelegate) and times the first layout, relayouts while the window is
+# resized and a repaint of the visible tiles. For comparison it also builds the
+# old grid of one ClickableContainer widget per pop in a 5-column QGridLayout.
+# Runs offscreen, no window is shown; pops have no images, so no disk I/O.
+#
+#   python bench_list_view.py [items]
+
+import os, sys, tempfile, time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication, QAbstractItemView, QGridLayout, QListView, QWidget
+
+from funko_pop import FunkoPop
+from thumbnail_loader import ThumbnailCache
+
+# Keep the thumbnail index out of the working directory
+ThumbnailCache.DIR = tempfile.mkdtemp(prefix="popkollect_bench_")
+ThumbnailCache.INDEX_PATH = os.path.join(ThumbnailCache.DIR, "index.db")
+
+from funko_list_model import FunkoListModel
+from pop_tile_delegate import PopTileDelegate
+from clickable_container import ClickableContainer
+
+WIDTHS = list(range(600, 2600, 100))   # a window being dragged wider
+HEIGHT = 800
+
+
+def timed(label, func):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<46}{elapsed * 1000:10.1f} ms")
+    return elapsed
+
+
+def make_funkos(count):
+    return [
+        FunkoPop(id=i, barcode=str(100000000 + i), name=f"Pop {i}", series="Bench",
+                 item_number=str(i), year=str(2000 + i % 25), market_value=float(i % 500))
+        for i in range(1, count + 1)
+    ]
+
+
+def make_view(model):
+    # Same settings as Home.initUI()
+    view = QListView()
+    view.setModel(model)
+    view.setItemDelegate(PopTileDelegate(view))
+    view.setViewMode(QListView.IconMode)
+    view.setResizeMode(QListView.Adjust)
+    view.setMovement(QListView.Static)
+    view.setLayoutMode(QListView.Batched)
+    view.setUniformItemSizes(True)
+    view.setSpacing(10)
+    view.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+    return view
+
+
+def lay_out(app, view, count):
+    # Batched layout continues on timers; run them until the last tile has a place
+    view.doItemsLayout()
+    last = view.model().index(count - 1)
+    while view.visualRect(last).isEmpty():
+        app.processEvents()
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    app = QApplication(sys.argv)
+    print(f"Collection grid with {count:,} pops of {PopTileDelegate.TILE_SIZE.width()}x{PopTileDelegate.TILE_SIZE.height()}")
+    funkos = make_funkos(count)
+
+    model = FunkoListModel()
+    view = make_view(model)
+    view.resize(1200, HEIGHT)
+    view.show()
+    app.processEvents()
+
+    timed("QListView: load model + first layout", lambda: (model.set_funkos(funkos), lay_out(app, view, count)))
+    timed(f"QListView: resize sweep ({len(WIDTHS)} widths)",
+          lambda: [(view.resize(width, HEIGHT), lay_out(app, view, count)) for width in WIDTHS])
+    view.resize(1200, HEIGHT)
+    lay_out(app, view, count)
+    top = view.visualRect(model.index(0)).top()
+    columns = sum(1 for row in range(min(count, 50)) if view.visualRect(model.index(row)).top() == top)
+    print(f"{'QListView: columns at 1200px':<46}{columns:10d}")
+    timed("QListView: repaint visible tiles", lambda: view.viewport().repaint())
+    view.scrollToBottom()
+    timed("QListView: scroll to bottom + repaint", lambda: (view.scrollToBottom(), view.viewport().repaint()))
+
+    # The pre-QListView grid: a widget per pop in a fixed 5-column QGridLayout
+    def build_widget_grid():
+        container = QWidget()
+        grid = QGridLayout(container)
+        grid.setSpacing(20)
+        for i, funko in enumerate(funkos):
+            grid.addWidget(ClickableContainer(funko, container), i // 5, i % 5)
+        grid.activate()
+        return container
+
+    timed("Widget grid: build + first layout", build_widget_grid)
+    del app
+
+
+if __name__ == "__main__":
+    main()
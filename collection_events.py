@@ -0,0 +1,45 @@
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, List
+
+# Which rows of funko_pops a write touched, by ID
+@dataclass
+class ChangeSet:
+    inserted: List[int] = field(default_factory=list)
+    updated: List[int] = field(default_factory=list)
+    removed: List[int] = field(default_factory=list)
+
+    def is_empty(self) -> bool:
+        return not (self.inserted or self.updated or self.removed)
+
+
+# Change notifications for the personal collection. FunkoDB publishes a ChangeSet
+# after every write; views subscribe and patch only the affected rows.
+# Callbacks run on the thread that did the write, so Qt subscribers should
+# forward to the GUI thread through a signal.
+class CollectionEvents:
+    _subscribers: List[Callable[[ChangeSet], None]] = []
+    _lock = threading.Lock()
+
+    @staticmethod
+    def subscribe(callback: Callable[[ChangeSet], None]):
+        with CollectionEvents._lock:
+            CollectionEvents._subscribers.append(callback)
+
+    @staticmethod
+    def unsubscribe(callback: Callable[[ChangeSet], None]):
+        with CollectionEvents._lock:
+            if callback in CollectionEvents._subscribers:
+                CollectionEvents._subscribers.remove(callback)
+
+    @staticmethod
+    def publish(changes: ChangeSet):
+        if changes.is_empty():
+            return
+        with CollectionEvents._lock:
+            subscribers = list(CollectionEvents._subscribers)
+        for callback in subscribers:
+            try:
+                callback(changes)
+            except Exception as e:
+                print("Error in collection change subscriber:", e)
@@ -0,0 +1,116 @@
+import sqlite3, threading
+from contextlib import contextmanager
+
+# Shared SQLite connection manager used by FunkoDB and FirebaseDB.
+# Each thread gets one long-lived connection per database file, so repeated
+# calls reuse the same connection (and its prepared-statement cache) instead
+# of paying connect + fsync on every statement.
+class ConnectionManager:
+    CACHED_STATEMENTS = 256
+
+    PRAGMAS = (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA cache_size=-20000",      # ~20 MB page cache
+        "PRAGMA mmap_size=268435456",    # 256 MB memory-mapped I/O
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA busy_timeout=5000",
+    )
+
+    _local = threading.local()
+    _lock = threading.Lock()
+    _thread_maps = []   # every thread's {path: connection} dict
+
+    @staticmethod
+    def get(path) -> sqlite3.Connection:
+        """Return this thread's connection to `path`, opening it on first use."""
+        connections = ConnectionManager._thread_connections()
+        conn = connections.get(path)
+        if conn is None:
+            conn = ConnectionManager._open(path)
+            connections[path] = conn
+        return conn
+
+    @staticmethod
+    @contextmanager
+    def transaction(path, immediate=True):
+        """
+        Run the enclosed statements in a single IMMEDIATE transaction.
+        BEGIN IMMEDIATE write-locks every attached database too; pass
+        immediate=False for a deferred BEGIN when an attached database is only
+        read, so each database is locked only once a statement writes to it.
+        Nested calls join the outer transaction instead of opening a new one.
+        """
+        conn = ConnectionManager.get(path)
+        if conn.in_transaction:
+            yield conn
+            return
+
+        conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+        try:
+            yield conn
+        except BaseException:
+            # SQLite may already have rolled back (SQLITE_FULL, IOERR, interrupt);
+            # a second ROLLBACK would raise and hide the original error
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        else:
+            conn.execute("COMMIT")
+
+    @staticmethod
+    @contextmanager
+    def attached(path, other_path, alias):
+        """Temporarily ATTACH `other_path` as `alias` on this thread's connection to `path`."""
+        conn = ConnectionManager.get(path)
+        conn.execute("ATTACH DATABASE ? AS " + alias, (other_path,))
+        try:
+            yield conn
+        finally:
+            conn.execute("DETACH DATABASE " + alias)
+
+    @staticmethod
+    def close_thread_connections():
+        """Close every connection opened by the calling thread."""
+        connections = ConnectionManager._thread_connections()
+        with ConnectionManager._lock:
+            for conn in connections.values():
+                conn.close()
+            connections.clear()
+
+    @staticmethod
+    def close_all():
+        """Close every connection opened by any thread (used at shutdown)."""
+        with ConnectionManager._lock:
+            for connections in ConnectionManager._thread_maps:
+                for conn in connections.values():
+                    try:
+                        conn.close()
+                    except sqlite3.Error:
+                        pass
+                connections.clear()
+
+    @staticmethod
+    def _thread_connections() -> dict:
+        connections = getattr(ConnectionManager._local, "connections", None)
+        if connections is None:
+            connections = ConnectionManager._local.connections = {}
+            with ConnectionManager._lock:
+                ConnectionManager._thread_maps.append(connections)
+        return connections
+
+    @staticmethod
+    def _open(path) -> sqlite3.Connection:
+        # isolation_level=None puts the connection in autocommit mode; multi-statement
+        # work goes through ConnectionManager.transaction() instead of implicit BEGINs.
+        # check_same_thread is off only so close_all() can close it at shutdown;
+        # the connection is otherwise used solely by the thread that opened it.
+        conn = sqlite3.connect(
+            path,
+            isolation_level=None,
+            check_same_thread=False,
+            cached_statements=ConnectionManager.CACHED_STATEMENTS,
+        )
+        for pragma in ConnectionManager.PRAGMAS:
+            conn.execute(pragma)
+        return conn
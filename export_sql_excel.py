@@ -1,38 +1,158 @@
-# import sqlite3
-# import pandas as pd
-# from PyQt5.QtWidgets import QFileDialog, QMessageBox
+import csv, os, sqlite3
 
-# def export_sql_excel(self):
-#     try:
-#         # Connect to your database
-#         conn = sqlite3.connect("funko_pops.db")
+# Export every table of a SQLite database to Excel (one sheet per table), or to
+# CSV / JSON Lines (one file per table). Rows are streamed from the cursor in
+# chunks, so memory stays flat however big the tables are.
+# Qt-free so it can run on a background job.
 
-#         # Get all table names in the database
-#         tables = pd.read_sql_query("SELECT name FROM sqlite_master WHERE type='table';", conn)
+CHUNK_SIZE = 5000
+EXCEL_MAX_ROWS = 1048576   # rows per worksheet, header included
+FORMATS = (".xlsx", ".csv", ".jsonl")
 
-#         if tables.empty:
-#             QMessageBox.warning(self, "No Tables Found", "The database contains no tables.")
-#             conn.close()
-#             return
 
-#         # Ask user where to save the Excel file
-#         file_path, _ = QFileDialog.getSaveFileName(self, "Save Excel File", "", "Excel Files (*.xlsx)")
+def export_tables(db_path, file_path, progress=None, chunk_size=CHUNK_SIZE) -> int:
+    """
+    Write each user table in db_path to file_path. The format follows the extension:
+    .xlsx writes one sheet per table; .csv and .jsonl write <name>_<table>.<ext>
+    files next to file_path. progress(rows_done, rows_total) is called per chunk.
+    Returns the table count.
+    """
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension not in FORMATS:
+        raise ValueError(f"Unsupported export format '{extension}' (use {', '.join(FORMATS)})")
 
-#         if not file_path:
-#             QMessageBox.warning(self, "Export Cancelled", "No file was saved.")
-#             conn.close()
-#             return
+    # Read-only, so a long export never blocks the app's writers
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        tables = _user_tables(conn)
+        if not tables:
+            return 0
+        counter = _RowCounter(sum(conn.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0] for table in tables), progress)
+        counter.report()
 
-#         # Create Excel writer
-#         with pd.ExcelWriter(file_path, engine='openpyxl') as writer:
-#             # Loop through each table and write it to a separate sheet
-#             for table_name in tables['name']:
-#                 df = pd.read_sql_query(f"SELECT * FROM {table_name}", conn)
-#                 df.to_excel(writer, sheet_name=table_name, index=False)
+        if extension == ".xlsx":
+            _export_xlsx(conn, tables, file_path, chunk_size, counter)
+        else:
+            _export_files(conn, tables, file_path, extension, chunk_size, counter)
+        return len(tables)
+    finally:
+        conn.close()
 
-#         conn.close()
 
-#         QMessageBox.information(self, "Export Successful", f"All tables exported successfully to:\n{file_path}")
+def table_file_path(file_path, table) -> str:
+    """Where a .csv / .jsonl export puts `table`."""
+    base, extension = os.path.splitext(file_path)
+    return f"{base}_{table}{extension}"
 
-#     except Exception as e:
-#         QMessageBox.critical(self, "Error", f"An error occurred:\n{e}")
+
+def _user_tables(conn):
+    # Skip SQLite's own tables and the internals of virtual (FTS) tables
+    rows = conn.execute("SELECT name, sql FROM sqlite_master WHERE type = 'table' ORDER BY rowid").fetchall()
+    virtual = [name for name, sql in rows if (sql or "").upper().startswith("CREATE VIRTUAL TABLE")]
+    return [
+        name for name, _ in rows
+        if not name.startswith("sqlite_")
+        and name not in virtual
+        and not any(name.startswith(f"{v}_") for v in virtual)
+    ]
+
+
+def _chunks(conn, table, chunk_size, sql=None):
+    cursor = conn.execute(sql or f'SELECT * FROM "{table}"')
+    columns = [description[0] for description in cursor.description]
+    yield columns
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            return
+        yield rows
+
+
+def _export_xlsx(conn, tables, file_path, chunk_size, counter):
+    from openpyxl import Workbook
+
+    # write_only streams each appended row to a temp file instead of keeping cells in memory
+    workbook = Workbook(write_only=True)
+    for table in tables:
+        chunks = _chunks(conn, table, chunk_size)
+        columns = next(chunks)
+        sheet, sheet_number, sheet_rows = None, 0, EXCEL_MAX_ROWS
+        for rows in chunks:
+            for row in rows:
+                if sheet_rows >= EXCEL_MAX_ROWS:
+                    # Tables past Excel's row limit continue on "<table> (2)", ...
+                    sheet_number += 1
+                    sheet = workbook.create_sheet(_sheet_title(table, sheet_number))
+                    sheet.append(columns)
+                    sheet_rows = 1
+                sheet.append([_cell_value(value) for value in row])
+                sheet_rows += 1
+            counter.add(len(rows))
+        if sheet is None:
+            workbook.create_sheet(_sheet_title(table, 1)).append(columns)
+    workbook.save(file_path)
+
+
+def _export_files(conn, tables, file_path, extension, chunk_size, counter):
+    written = []
+    try:
+        for table in tables:
+            path = table_file_path(file_path, table)
+            written.append(path)
+            chunks = _chunks(conn, table, chunk_size, _jsonl_sql(conn, table) if extension == ".jsonl" else None)
+            columns = next(chunks)
+            with open(path, "w", newline="", encoding="utf-8") as f:
+                if extension == ".csv":
+                    writer = csv.writer(f)
+                    writer.writerow(columns)
+                    for rows in chunks:
+                        writer.writerows(rows)
+                        counter.add(len(rows))
+                else:
+                    # Each row arrives already encoded as one JSON object
+                    for rows in chunks:
+                        f.writelines(row[0] + "\n" for row in rows)
+                        counter.add(len(rows))
+    except BaseException:
+        # Don't leave half-written files behind (cancelled or failed export)
+        for path in written:
+            if os.path.exists(path):
+                os.remove(path)
+        raise
+
+
+def _jsonl_sql(conn, table):
+    # Let SQLite's json_object() encode the rows; BLOBs (not valid JSON) become hex
+    columns = [row[1] for row in conn.execute(f'PRAGMA table_info("{table}")')]
+    fields = ", ".join(
+        f"'{column}', CASE WHEN typeof(\"{column}\") = 'blob' THEN hex(\"{column}\") ELSE \"{column}\" END"
+        for column in columns
+    )
+    return f'SELECT json_object({fields}) FROM "{table}"'
+
+
+def _sheet_title(table, number):
+    # Excel sheet titles are limited to 31 characters
+    suffix = f" ({number})" if number > 1 else ""
+    return table[:31 - len(suffix)] + suffix
+
+
+def _cell_value(value):
+    if isinstance(value, bytes):
+        return value.hex()
+    return value
+
+
+class _RowCounter:
+    def __init__(self, total, progress):
+        self.total = total
+        self.done = 0
+        self.progress = progress
+
+    def add(self, rows):
+        self.done += rows
+        self.report()
+
+    def report(self):
+        if self.progress:
+            self.progress(self.done, self.total)
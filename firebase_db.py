@@ -1,6 +1,8 @@
-import sqlite3, os
+import sqlite3, os, time
+from itertools import islice
 from funko_pop import FunkoPop
-from typing import List
+from typing import Iterable, List, Optional, Tuple
+from db_connection import ConnectionManager
 
 # SQLite database handler for Funko Pops fetched from Firebase
 class FirebaseDB:
@@ -18,13 +20,98 @@ class FirebaseDB:
             PRIMARY KEY (barcode, year)
         );
         '''
+        # Per-collection high-water mark (latest Firestore updatedAt already synced)
+        state_sql = '''
+        CREATE TABLE IF NOT EXISTS sync_state (
+            collection TEXT PRIMARY KEY,
+            high_water TEXT
+        );
+        '''
+        # One row per completed catalog sync (unix seconds it started, rows written)
+        runs_sql = '''
+        CREATE TABLE IF NOT EXISTS sync_runs (
+            started_at INTEGER PRIMARY KEY,
+            collection TEXT,
+            rows INTEGER
+        );
+        '''
+        # Market value history: a row only when a catalog value actually changes.
+        # WITHOUT ROWID keeps it clustered on (barcode, year, observed_at), so
+        # per-pop time-series reads are a single range scan.
+        history_sql = '''
+        CREATE TABLE market_value_history (
+            barcode TEXT,
+            year TEXT,
+            observed_at INTEGER,
+            market_value REAL,
+            PRIMARY KEY (barcode, year, observed_at)
+        ) WITHOUT ROWID;
+        '''
+        history_index_sql = "CREATE INDEX IF NOT EXISTS idx_history_observed_at ON market_value_history(observed_at)"
+        history_trigger_sql = [
+            '''
+            CREATE TRIGGER IF NOT EXISTS firebase_funkos_history_ai AFTER INSERT ON firebase_funkos BEGIN
+                INSERT OR REPLACE INTO market_value_history (barcode, year, observed_at, market_value)
+                VALUES (new.barcode, new.year, CAST(strftime('%s', 'now') AS INTEGER), new.marketValue);
+            END
+            ''',
+            '''
+            CREATE TRIGGER IF NOT EXISTS firebase_funkos_history_au AFTER UPDATE OF marketValue ON firebase_funkos
+            WHEN old.marketValue IS NOT new.marketValue BEGIN
+                INSERT OR REPLACE INTO market_value_history (barcode, year, observed_at, market_value)
+                VALUES (new.barcode, new.year, CAST(strftime('%s', 'now') AS INTEGER), new.marketValue);
+            END
+            ''',
+        ]
         try:
-            with sqlite3.connect(FirebaseDB.URL) as conn:
-                cursor = conn.cursor()
-                cursor.execute(sql)
+            conn = ConnectionManager.get(FirebaseDB.URL)
+            conn.execute(sql)
+            conn.execute(state_sql)
+            conn.execute(runs_sql)
+
+            history_exists = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'market_value_history'"
+            ).fetchone()
+            if not history_exists:
+                with ConnectionManager.transaction(FirebaseDB.URL):
+                    conn.execute(history_sql)
+                    # Current catalog values become the first point of every series
+                    conn.execute('''
+                        INSERT INTO market_value_history (barcode, year, observed_at, market_value)
+                        SELECT barcode, year, CAST(strftime('%s', 'now') AS INTEGER), marketValue
+                        FROM firebase_funkos
+                    ''')
+            conn.execute(history_index_sql)
+            for statement in history_trigger_sql:
+                conn.execute(statement)
         except sqlite3.Error as e:
             print("Error creating table:", e)
 
+    @staticmethod
+    def get_high_water(collection: str) -> Optional[str]:
+        """Return the stored updatedAt high-water mark for `collection`, or None."""
+        sql = "SELECT high_water FROM sync_state WHERE collection = ?"
+        try:
+            conn = ConnectionManager.get(FirebaseDB.URL)
+            row = conn.execute(sql, (collection,)).fetchone()
+            if row:
+                return row[0]
+        except sqlite3.Error as e:
+            print("Error reading high-water mark:", e)
+        return None
+
+    @staticmethod
+    def set_high_water(collection: str, high_water: Optional[str]):
+        sql = '''
+        INSERT INTO sync_state (collection, high_water) VALUES (?, ?)
+        ON CONFLICT(collection) DO UPDATE SET high_water = excluded.high_water
+        '''
+        try:
+            conn = ConnectionManager.get(FirebaseDB.URL)
+            conn.execute(sql, (collection, high_water))
+        except sqlite3.Error as e:
+            print("Error saving high-water mark:", e)
+
     @staticmethod
     def upsert_funko(barcode, name, market_value, year):
         print(f"FirebaseDB.upsert_funko() was called")
@@ -38,13 +125,163 @@ class FirebaseDB:
             marketValue = excluded.marketValue
         '''
         try:
-            with sqlite3.connect(FirebaseDB.URL) as conn:
-                cursor = conn.cursor()
-                cursor.execute(sql, (barcode, name, market_value, year))
-                conn.commit()
+            conn = ConnectionManager.get(FirebaseDB.URL)
+            conn.execute(sql, (barcode, name, market_value, year))
         except sqlite3.Error as e:
             print("Error upserting funko:", e)
-        conn.commit()
+
+    @staticmethod
+    def upsert_many(rows: Iterable[Tuple], batch_size: int = 1000, progress=None) -> int:
+        """
+        Upsert (barcode, name, market_value, year) rows, one transaction per batch.
+        Rows are pulled from the iterable batch_size at a time, so a generator
+        can be streamed in without materializing the whole catalog. The write
+        lock is only held while a batch is written, never while the next one
+        is being downloaded.
+        progress(written, 0) is called before each batch is written, never after
+        the last commit, so a cancel raised from it leaves no batch half-reported.
+        Returns the number of rows written. If a batch fails its sqlite3.Error is
+        re-raised with a rows_written attribute; batches before it stay committed
+        (upserts are safe to repeat).
+        """
+        print("FirebaseDB.upsert_many() was called")
+        sql = '''
+        INSERT INTO firebase_funkos (barcode, name, marketValue, year)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(barcode, year) DO UPDATE SET
+            name = excluded.name,
+            marketValue = excluded.marketValue
+        '''
+        rows = iter(rows)
+        written = 0
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            if progress:
+                progress(written, 0)
+            try:
+                with ConnectionManager.transaction(FirebaseDB.URL) as conn:
+                    conn.executemany(sql, batch)
+            except sqlite3.Error as e:
+                print(f"Error upserting funkos after {written} rows:", e)
+                e.rows_written = written
+                raise
+            written += len(batch)
+        return written
+
+    @staticmethod
+    def contains(barcode, year) -> bool:
+        """Primary-key lookup: is (barcode, year) in the catalog?"""
+        if not os.path.exists(FirebaseDB.URL):
+            return False  # Nothing fetched yet; don't create an empty catalog file
+        sql = "SELECT 1 FROM firebase_funkos WHERE barcode = ? AND year = ?"
+        try:
+            conn = ConnectionManager.get(FirebaseDB.URL)
+            return conn.execute(sql, (barcode, year)).fetchone() is not None
+        except sqlite3.Error as e:
+            print("Error looking up funko:", e)
+        return False
+
+    @staticmethod
+    def record_sync_run(collection: str, started_at: int, rows: int):
+        """Remember a completed sync; top_movers() measures change since the latest one."""
+        sql = "INSERT OR REPLACE INTO sync_runs (started_at, collection, rows) VALUES (?, ?, ?)"
+        try:
+            conn = ConnectionManager.get(FirebaseDB.URL)
+            conn.execute(sql, (started_at, collection, rows))
+        except sqlite3.Error as e:
+            print("Error recording sync run:", e)
+
+    @staticmethod
+    def last_sync_started_at() -> Optional[int]:
+        if not os.path.exists(FirebaseDB.URL):
+            return None
+        try:
+            conn = ConnectionManager.get(FirebaseDB.URL)
+            return conn.execute("SELECT MAX(started_at) FROM sync_runs").fetchone()[0]
+        except sqlite3.Error as e:
+            print("Error reading sync runs:", e)
+        return None
+
+    @staticmethod
+    def value_at(barcode, year, when: int) -> Optional[float]:
+        """Market value of (barcode, year) as of unix time `when`, or None if unknown then."""
+        sql = '''
+        SELECT market_value FROM market_value_history
+        WHERE barcode = ? AND year = ? AND observed_at <= ?
+        ORDER BY observed_at DESC LIMIT 1
+        '''
+        if not os.path.exists(FirebaseDB.URL):
+            return None
+        try:
+            conn = ConnectionManager.get(FirebaseDB.URL)
+            row = conn.execute(sql, (barcode, year, when)).fetchone()
+            if row:
+                return row[0]
+        except sqlite3.Error as e:
+            print("Error reading value history:", e)
+        return None
+
+    @staticmethod
+    def change_over_days(barcode, year, days: int) -> Optional[Tuple[float, float, float]]:
+        """(value N days ago, value now, difference), or None without enough history."""
+        now = int(time.time())
+        old_value = FirebaseDB.value_at(barcode, year, now - days * 86400)
+        new_value = FirebaseDB.value_at(barcode, year, now)
+        if old_value is None or new_value is None:
+            return None
+        return old_value, new_value, new_value - old_value
+
+    @staticmethod
+    def get_value_history(barcode, year, days: Optional[int] = None) -> List[Tuple[int, float]]:
+        """(observed_at, market_value) points for one pop, oldest first."""
+        sql = '''
+        SELECT observed_at, market_value FROM market_value_history
+        WHERE barcode = ? AND year = ? AND observed_at >= ?
+        ORDER BY observed_at
+        '''
+        if not os.path.exists(FirebaseDB.URL):
+            return []
+        since = int(time.time()) - days * 86400 if days else 0
+        try:
+            conn = ConnectionManager.get(FirebaseDB.URL)
+            return conn.execute(sql, (barcode, year, since)).fetchall()
+        except sqlite3.Error as e:
+            print("Error reading value history:", e)
+        return []
+
+    @staticmethod
+    def top_movers(limit: int = 10, since: Optional[int] = None) -> List[Tuple[str, str, str, float, float]]:
+        """
+        Catalog pops whose value moved the most since `since` (default: the start of the
+        last completed sync), as (barcode, year, name, old_value, new_value), biggest
+        absolute change first.
+        """
+        if since is None:
+            since = FirebaseDB.last_sync_started_at()
+            if since is None:
+                return []
+        sql = '''
+        SELECT barcode, year, name, old_value, new_value FROM (
+            SELECT h.barcode, h.year, f.name,
+                (SELECT p.market_value FROM market_value_history AS p
+                 WHERE p.barcode = h.barcode AND p.year = h.year AND p.observed_at < ?
+                 ORDER BY p.observed_at DESC LIMIT 1) AS old_value,
+                f.marketValue AS new_value
+            FROM (SELECT DISTINCT barcode, year FROM market_value_history WHERE observed_at >= ?) AS h
+            JOIN firebase_funkos AS f ON f.barcode = h.barcode AND f.year = h.year
+        )
+        WHERE old_value IS NOT NULL AND old_value IS NOT new_value
+        ORDER BY ABS(new_value - old_value) DESC
+        LIMIT ?
+        '''
+        try:
+            conn = ConnectionManager.get(FirebaseDB.URL)
+            return conn.execute(sql, (since, since, limit)).fetchall()
+        except sqlite3.Error as e:
+            print("Error computing top movers:", e)
+        return []
 
     @staticmethod
     def get_market_value(barcode, year=None):
@@ -57,12 +294,10 @@ class FirebaseDB:
             params = (barcode,)
 
         try:
-            with sqlite3.connect(FirebaseDB.URL) as conn:
-                cursor = conn.cursor()
-                cursor.execute(sql, params)
-                row = cursor.fetchone()
-                if row:
-                    return row[0]
+            conn = ConnectionManager.get(FirebaseDB.URL)
+            row = conn.execute(sql, params).fetchone()
+            if row:
+                return row[0]
         except sqlite3.Error as e:
             print("Error fetching market value:", e)
         return None  # return None if not found
@@ -73,18 +308,15 @@ class FirebaseDB:
         funkos = []
         sql = "SELECT * FROM firebase_funkos"
         try:
-            with sqlite3.connect(FirebaseDB.URL) as conn:
-                cursor = conn.cursor()
-                cursor.execute(sql)
-                rows = cursor.fetchall()
-                for row in rows:
-                    funko = FunkoPop.from_firebase_funkos(
-                        barcode=row[0],
-                        name=row[1],
-                        market_value=row[2],
-                        year=row[3]
-                    )
-                    funkos.append(funko)
+            conn = ConnectionManager.get(FirebaseDB.URL)
+            for row in conn.execute(sql):
+                funko = FunkoPop.from_firebase_funkos(
+                    barcode=row[0],
+                    name=row[1],
+                    market_value=row[2],
+                    year=row[3]
+                )
+                funkos.append(funko)
         except sqlite3.Error as e:
             print("Error fetching funkos:", e)
         return funkos
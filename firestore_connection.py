@@ -1,13 +1,9 @@
 import os
 import traceback
-from typing import List, Optional
+from typing import Iterator, List, Optional, Tuple
 
-try:
-    import firebase_admin
-    from firebase_admin import credentials, firestore
-    FIREBASE_AVAILABLE = True
-except Exception:
-    FIREBASE_AVAILABLE = False
+# firebase_admin (grpc, google-cloud) is slow to import, so it is only loaded
+# when a FirestoreConnection is created
 
 from funko_pop import FunkoPop as Funko
 
@@ -21,14 +17,21 @@ class FirestoreConnection:
       conn.update_market_value(doc_id, 12.34)
     """
 
+    # Fields the local catalog table (firebase_funkos) actually stores
+    CATALOG_FIELDS = ["barcode", "name", "marketValue", "year"]
+
     # Hardcoding the service account path here
     SERVICE_ACCOUNT_PATH = "funkokenny-5585a-firebase-adminsdk-fbsvc-aa0164b777.json"  # Update with your actual file path
     DATABASE_URL = "https://funkokenny-5585a-default-rtdb.asia-southeast1.firebasedatabase.app"  # Update with your actual Firebase Database URL if necessary
 
     def __init__(self):
         self.db = None
+        self.high_water_mark = None
         try:
-            if not FIREBASE_AVAILABLE:
+            try:
+                import firebase_admin
+                from firebase_admin import credentials, firestore
+            except ImportError:
                 raise RuntimeError("firebase-admin package not installed (pip install firebase-admin)")
 
             if not os.path.exists(self.SERVICE_ACCOUNT_PATH):
@@ -141,3 +144,46 @@ class FirestoreConnection:
             print("Failed to load funkos from Firestore:", e)
             traceback.print_exc()
         return funkos
+
+    def iter_funkos(self, page_size: int = 500, updated_since=None) -> Iterator[Tuple[str, str, float, str]]:
+        """
+        Stream the 'funkos' collection page by page.
+        Only the catalog fields are requested, and each document is yielded as a
+        (barcode, name, market_value, year) tuple as soon as its page arrives,
+        so memory stays bounded by page_size regardless of collection size.
+
+        If updated_since (a datetime) is given, only documents whose updatedAt is
+        at or after it are fetched. The newest updatedAt seen is left in
+        self.high_water_mark for the caller to persist once the rows are stored.
+        """
+        print("FirestoreConnection.iter_funkos() was called")
+        self.high_water_mark = None
+        if self.db is None:
+            print("Firestore not initialized")
+            return
+
+        query = self.db.collection("funkos").select(self.CATALOG_FIELDS + ["updatedAt"])
+        if updated_since is not None:
+            # Inequality filters must be ordered on the same field first
+            query = query.where("updatedAt", ">=", updated_since).order_by("updatedAt")
+        query = query.order_by("__name__").limit(page_size)
+
+        last_doc = None
+        while True:
+            page = query.start_after(last_doc) if last_doc is not None else query
+            count = 0
+            for doc in page.stream():
+                data = doc.to_dict() or {}
+                updated_at = data.get("updatedAt")
+                if updated_at is not None and (self.high_water_mark is None or updated_at > self.high_water_mark):
+                    self.high_water_mark = updated_at
+                yield (
+                    data.get("barcode") or "",
+                    data.get("name") or "",
+                    float(data.get("marketValue") or 0.0),
+                    data.get("year") or "",
+                )
+                last_doc = doc
+                count += 1
+            if count < page_size:
+                break
@@ -1,132 +1,470 @@
-import sqlite3
-from typing import List
+import re, threading, time
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional, Tuple
 from funko_pop import FunkoPop
+from db_connection import ConnectionManager
+from collection_events import ChangeSet, CollectionEvents
+from migrations import Migrations
+
+# Aggregates over the collection, computed in SQL by FunkoDB.stats()
+@dataclass
+class CollectionStats:
+    count: int = 0
+    total_value: float = 0.0
+    average_value: float = 0.0
+    by_series: List[Tuple[str, int, float]] = field(default_factory=list)   # (series, count, value), most valuable first
+    by_year: List[Tuple[str, int, float]] = field(default_factory=list)     # (year, count, value), newest first
+    top: List[FunkoPop] = field(default_factory=list)                       # most valuable pops
+    buckets: List[Tuple[str, int]] = field(default_factory=list)            # (value range, count)
+
+# Outcome of one market value sync, as stored in sync_reports by FunkoDB.sync_market_values_from()
+@dataclass
+class SyncReport:
+    id: Optional[int] = None
+    synced_at: int = 0        # unix seconds
+    matched: int = 0          # pops found in the catalog by (barcode, year)
+    changed: int = 0          # matched pops whose market value actually moved
+    unmatched: int = 0        # pops with no catalog entry
+    total_delta: float = 0.0  # change in collection value caused by the sync
+    gainers: List[Tuple[int, str, float, float]] = field(default_factory=list)   # (id, name, old, new), biggest rise first
+    losers: List[Tuple[int, str, float, float]] = field(default_factory=list)    # (id, name, old, new), biggest drop first
 
 # SQLite database handler for personal Funko Pop collection
 class FunkoDB:
     DB_PATH = "funko_pops.db"
 
+    # Columns written by add/update, in FunkoPop attribute names
+    WRITE_COLUMNS = (
+        "barcode", "name", "series", "item_number", "market_value", "year", "image_path",
+        "variant", "exclusive", "condition", "purchase_price", "firestore_id", "image_hash",
+    )
+
+    # Column order expected by _row_to_funko
+    COLUMNS = "id, " + ", ".join(WRITE_COLUMNS)
+
+    # Sort keys accepted by get_funkos_page, mapped to the indexed expression they
+    # order by. Nullable columns are wrapped in IFNULL so keyset comparisons
+    # stay well defined; the indexes in migrations.py use the exact same expressions.
+    SORT_KEYS = {
+        "id": "id",
+        "name": "name",
+        "series": "series",
+        "market_value": "IFNULL(market_value, 0)",
+        "year": "IFNULL(year, '')",
+    }
+
+    # Columns get_funkos_page can filter on (equality)
+    FILTER_COLUMNS = ("barcode", "name", "series", "item_number", "year")
+
+    # Upper bounds of the stats() value distribution buckets; the last bucket is open-ended
+    VALUE_BUCKETS = (10, 25, 50, 100, 250)
+
+    # Per thread, like the connections: (connection, cache key, top_n, CollectionStats).
+    # The key only means something for the connection it was read from.
+    _stats_cache = threading.local()
+
     @staticmethod
-    def create_table():
+    def migrate() -> int:
+        """Bring funko_pops.db up to the latest schema version. Run once at startup."""
+        print("FunkoDB.migrate() was called")
+        return Migrations.migrate(FunkoDB.DB_PATH)
 
-        print("FunkoDB.create_table() was called")
-        
-        sql = """
-        CREATE TABLE IF NOT EXISTS funko_pops (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            barcode TEXT,
-            name TEXT NOT NULL,
-            series TEXT NOT NULL,
-            item_number TEXT NOT NULL,
-            market_value REAL,
-            year TEXT,
-            image_path TEXT
-        );
-        """
-        with sqlite3.connect(FunkoDB.DB_PATH) as conn:
-            cursor = conn.cursor()
-            cursor.execute(sql)
-            conn.commit()
-            # conn.close()  # Close connection to ensure all changes are written
-            # print("Database connection closed.")
-        
-            # # Reopen the connection
-            # conn = sqlite3.connect(FunkoDB.DB_PATH)
-            # print("Database connection reopened.")
+    @staticmethod
+    def create_table():
+        # Kept for existing callers; the schema is now owned by migrations.py
+        FunkoDB.migrate()
 
     @staticmethod
     def add_funko(funko: FunkoPop) -> int:
         print("FunkoDB.add_funko() was called")
-        sql = """
-        INSERT INTO funko_pops (barcode, name, series, item_number, market_value, year, image_path)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-        """
-        with sqlite3.connect(FunkoDB.DB_PATH) as conn:
-            cursor = conn.cursor()
-            cursor.execute(sql, (
-                funko.barcode,
-                funko.name,
-                funko.series,
-                funko.item_number,
-                funko.market_value,
-                funko.year,
-                funko.image_path
-            ))
-            conn.commit()
-            return cursor.lastrowid  # Return the auto-generated ID
+        conn = ConnectionManager.get(FunkoDB.DB_PATH)
+        cursor = conn.execute(FunkoDB._insert_sql(), FunkoDB._values(funko))
+        funko.mark_clean()
+        CollectionEvents.publish(ChangeSet(inserted=[cursor.lastrowid]))
+        return cursor.lastrowid  # Return the auto-generated ID
+
+    @staticmethod
+    def add_funkos(funkos: Iterable[FunkoPop]) -> List[int]:
+        """
+        Insert many Funkos in one transaction and return their new IDs in input order.
+        """
+        print("FunkoDB.add_funkos() was called")
+        sql = FunkoDB._insert_sql()
+        funkos = list(funkos)
+        rows = [FunkoDB._values(funko) for funko in funkos]
+        if not rows:
+            return []
+
+        with ConnectionManager.transaction(FunkoDB.DB_PATH) as conn:
+            # The IMMEDIATE transaction holds the write lock, so AUTOINCREMENT hands
+            # out a contiguous block of IDs starting right after the current sequence.
+            first_id = conn.execute(
+                "SELECT COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'funko_pops'), 0) + 1"
+            ).fetchone()[0]
+            conn.executemany(sql, rows)
+        for funko in funkos:
+            funko.mark_clean()
+        ids = list(range(first_id, first_id + len(rows)))
+        CollectionEvents.publish(ChangeSet(inserted=ids))
+        return ids
 
     @staticmethod
     def get_all_funkos() -> List[FunkoPop]:
         # print("FunkoDB.get_all_funkos() was called")
+        sql = f"SELECT {FunkoDB.COLUMNS} FROM funko_pops"
+        conn = ConnectionManager.get(FunkoDB.DB_PATH)
+        return [FunkoDB._row_to_funko(row) for row in conn.execute(sql)]
+
+    @staticmethod
+    def get_funkos_page(sort_key: str = "id", after: Optional[Tuple] = None, limit: int = 200,
+                        filters: Optional[dict] = None) -> Tuple[List[FunkoPop], Optional[Tuple]]:
+        """
+        Keyset-paginated read of the collection.
+        sort_key is one of SORT_KEYS, prefixed with "-" for descending order.
+        after is the cursor returned by the previous call (None for the first page).
+        filters maps FILTER_COLUMNS to the value they must equal.
+        Returns (funkos, cursor); cursor is None once the last page has been read.
+        """
+        descending = sort_key.startswith("-")
+        key = sort_key.lstrip("-")
+        if key not in FunkoDB.SORT_KEYS:
+            raise ValueError(f"Unknown sort key: {sort_key}")
+        expr = FunkoDB.SORT_KEYS[key]
+
+        where, params = [], []
+        for column, value in (filters or {}).items():
+            if column not in FunkoDB.FILTER_COLUMNS:
+                raise ValueError(f"Cannot filter on column: {column}")
+            where.append(f"{column} = ?")
+            params.append(value)
+        if after is not None:
+            # Seek straight past the last row of the previous page instead of OFFSET-scanning.
+            # Spelled out rather than as a (expr, id) row value so SQLite can range-search
+            # the expression indexes too.
+            op = "<" if descending else ">"
+            where.append(f"{expr} {op}= ? AND ({expr} {op} ? OR id {op} ?)")
+            params.extend((after[0], after[0], after[1]))
+
+        direction = "DESC" if descending else "ASC"
+        sql = f"SELECT {FunkoDB.COLUMNS}, {expr} FROM funko_pops"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY {expr} {direction}, id {direction} LIMIT ?"
+        params.append(limit)
+
+        conn = ConnectionManager.get(FunkoDB.DB_PATH)
+        rows = conn.execute(sql, params).fetchall()
+        funkos = [FunkoDB._row_to_funko(row) for row in rows]
+        cursor = (rows[-1][-1], rows[-1][0]) if len(rows) == limit else None
+        return funkos, cursor
+
+    @staticmethod
+    def search(query: str, limit: int = 200) -> List[FunkoPop]:
+        """
+        Full-text search over name, series, item number and barcode.
+        Every word in `query` is matched as a prefix ("spi man" finds "Spider-Man").
+        Results come newest first: ordering by rowid lets FTS5 stop after `limit`
+        hits, whereas bm25 ranking would score every match of a short prefix.
+        """
+        terms = re.findall(r"\w+", query)
+        if not terms:
+            return []
+        match = " ".join(f'"{term}"*' for term in terms)
+        columns = ", ".join(f"p.{column.strip()}" for column in FunkoDB.COLUMNS.split(","))
+        sql = f"""
+        SELECT {columns} FROM funko_pops_fts AS fts
+        JOIN funko_pops AS p ON p.id = fts.rowid
+        WHERE funko_pops_fts MATCH ?
+        ORDER BY fts.rowid DESC
+        LIMIT ?
+        """
+        conn = ConnectionManager.get(FunkoDB.DB_PATH)
+        return [FunkoDB._row_to_funko(row) for row in conn.execute(sql, (match, limit))]
+
+    @staticmethod
+    def stats(top_n: int = 5) -> CollectionStats:
+        """
+        Collection totals, per-series and per-year breakdowns, the top_n most valuable
+        pops and a value distribution, all aggregated inside SQLite.
+        Results are cached until the database changes: PRAGMA data_version moves on
+        commits from other connections, total_changes on writes from this one.
+        Both are per connection, so the cache is kept per thread and tied to the
+        connection it was computed on.
+        """
+        conn = ConnectionManager.get(FunkoDB.DB_PATH)
+        key = (conn.execute("PRAGMA data_version").fetchone()[0], conn.total_changes)
+        cached = getattr(FunkoDB._stats_cache, "entry", None)
+        # Holding the connection keeps a reopened one from matching by identity
+        if cached and cached[0] is conn and cached[1] == key and cached[2] == top_n:
+            return cached[3]
+
+        stats = CollectionStats()
+        stats.count, stats.total_value, stats.average_value = conn.execute(
+            "SELECT COUNT(*), IFNULL(SUM(market_value), 0.0), IFNULL(AVG(IFNULL(market_value, 0)), 0.0) FROM funko_pops"
+        ).fetchone()
+        stats.by_series = conn.execute("""
+            SELECT series, COUNT(*), IFNULL(SUM(market_value), 0) AS value
+            FROM funko_pops GROUP BY series ORDER BY value DESC, series
+        """).fetchall()
+        stats.by_year = conn.execute("""
+            SELECT IFNULL(year, ''), COUNT(*), IFNULL(SUM(market_value), 0)
+            FROM funko_pops GROUP BY IFNULL(year, '') ORDER BY IFNULL(year, '') DESC
+        """).fetchall()
+        # Walks idx_funko_pops_market_value backwards and stops after top_n rows
+        stats.top = FunkoDB.get_funkos_page("-market_value", None, top_n)[0]
+
+        edges = FunkoDB.VALUE_BUCKETS
+        labels = [f"${low}-{high}" for low, high in zip((0,) + edges, edges)] + [f"${edges[-1]}+"]
+        bucket_case = " ".join(f"WHEN IFNULL(market_value, 0) < {high} THEN {i}" for i, high in enumerate(edges))
+        counts = dict(conn.execute(f"""
+            SELECT CASE {bucket_case} ELSE {len(edges)} END AS bucket, COUNT(*)
+            FROM funko_pops GROUP BY bucket
+        """).fetchall())
+        stats.buckets = [(label, counts.get(i, 0)) for i, label in enumerate(labels)]
+
+        FunkoDB._stats_cache.entry = (conn, key, top_n, stats)
+        return stats
+
+    @staticmethod
+    def get_funkos_by_ids(funko_ids: Iterable[int]) -> List[FunkoPop]:
+        """Fetch the given IDs (missing ones are skipped), ordered by ID."""
+        funko_ids = list(funko_ids)
         funkos = []
-        sql = "SELECT * FROM funko_pops"
-        with sqlite3.connect(FunkoDB.DB_PATH) as conn:
-            cursor = conn.cursor()
-            cursor.execute(sql)
-            rows = cursor.fetchall()
-            for row in rows:
-                funko = FunkoPop.from_detailed(
-                    id=row[0],
-                    barcode=row[1],
-                    name=row[2],
-                    series=row[3],
-                    item_number=row[4],
-                    market_value=row[5],
-                    year=row[6],
-                    image_path=row[7]
-                )
-                funkos.append(funko)
+        conn = ConnectionManager.get(FunkoDB.DB_PATH)
+        # Stay well under SQLite's bound-parameter limit
+        for start in range(0, len(funko_ids), 500):
+            chunk = funko_ids[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            sql = f"SELECT {FunkoDB.COLUMNS} FROM funko_pops WHERE id IN ({placeholders})"
+            funkos.extend(FunkoDB._row_to_funko(row) for row in conn.execute(sql, chunk))
+        funkos.sort(key=lambda funko: funko.id)
         return funkos
 
     @staticmethod
-    def update_funko(funko: FunkoPop):
-        
-        print("FunkoDB.update_funko() was called")
+    def _row_to_funko(row) -> FunkoPop:
+        # row holds COLUMNS in order (any trailing extras are ignored)
+        funko = FunkoPop(id=row[0], **dict(zip(FunkoDB.WRITE_COLUMNS, row[1:])))
+        funko.mark_clean()   # matches its row, so later edits are tracked field by field
+        return funko
 
+    @staticmethod
+    def _values(funko: FunkoPop) -> tuple:
+        return tuple(getattr(funko, column) for column in FunkoDB.WRITE_COLUMNS)
+
+    @staticmethod
+    def _insert_sql() -> str:
+        columns = ", ".join(FunkoDB.WRITE_COLUMNS)
+        placeholders = ", ".join("?" * len(FunkoDB.WRITE_COLUMNS))
+        return f"INSERT INTO funko_pops ({columns}) VALUES ({placeholders})"
+
+    @staticmethod
+    def update_funko(funko: FunkoPop) -> int:
+        """
+        Write only the fields of `funko` that changed since it was loaded or last saved.
+        A FunkoPop that was never loaded or saved (e.g. FunkoPop(id=5, ...)) has
+        every column written, as before.
+        """
+        print("FunkoDB.update_funko() was called")
         print(f"Funko ID in FunkoDB: {funko.id}")
-        sql = """
-        UPDATE funko_pops SET barcode=?, name=?, series=?, item_number=?, market_value=?, year=?, image_path=?
-        WHERE id=?
-        """
-        with sqlite3.connect(FunkoDB.DB_PATH) as conn:
-            cursor = conn.cursor()
-            cursor.execute(sql, (
-                funko.barcode,
-                funko.name,
-                funko.series,
-                funko.item_number,
-                funko.market_value,
-                funko.year,
-                funko.image_path,
-                funko.id
-            ))
-            conn.commit()
-            print("Funko in funko_pops.db was updated successfully")
+        changed = FunkoDB.update_funkos([funko])
+        print("Funko in funko_pops.db was updated successfully" if changed else "Funko had no changes to save")
+        return changed
+
+    @staticmethod
+    def update_funkos(funkos: Iterable[FunkoPop]) -> int:
+        """
+        Save the changed fields of many Funkos in one transaction; unchanged Funkos
+        are skipped and never-loaded ones write every column. Returns the number of rows changed.
+        """
+        print("FunkoDB.update_funkos() was called")
+        funkos = [funko for funko in funkos if funko.is_dirty()]
+        changed = FunkoDB.update_fields((funko.id, funko.dirty_fields()) for funko in funkos)
+        for funko in funkos:
+            funko.mark_clean()
+        print(f"{changed} Funkos in funko_pops.db were updated successfully")
+        return changed
+
+    @staticmethod
+    def update_fields(changes: Iterable[Tuple[int, dict]]) -> int:
+        """
+        Column-level UPDATEs: each (id, {column: value}) sets just those columns.
+        Rows changing the same set of columns share one statement (executemany),
+        all inside a single transaction. Returns the number of rows changed.
+        """
+        by_columns = {}
+        for funko_id, values in changes:
+            if not values:
+                continue
+            unknown = set(values) - set(FunkoDB.WRITE_COLUMNS)
+            if unknown:
+                raise ValueError(f"Not funko_pops columns: {', '.join(sorted(unknown))}")
+            columns = tuple(sorted(values))
+            by_columns.setdefault(columns, []).append(tuple(values[column] for column in columns) + (funko_id,))
+        if not by_columns:
+            return 0
+
+        changed = 0
+        updated_ids = []
+        with ConnectionManager.transaction(FunkoDB.DB_PATH) as conn:
+            for columns, rows in by_columns.items():
+                assignments = ", ".join(f"{column}=?" for column in columns)
+                cursor = conn.executemany(f"UPDATE funko_pops SET {assignments} WHERE id=?", rows)
+                changed += cursor.rowcount
+                updated_ids += [row[-1] for row in rows]
+        CollectionEvents.publish(ChangeSet(updated=updated_ids))
+        return changed
+
+    @staticmethod
+    def set_images(images: Iterable[Tuple[int, str, str]]) -> int:
+        """Point pops at stored images: (id, image_hash, image_path) per pop. Returns rows changed."""
+        print("FunkoDB.set_images() was called")
+        images = list(images)
+        sql = "UPDATE funko_pops SET image_hash=?, image_path=? WHERE id=?"
+        with ConnectionManager.transaction(FunkoDB.DB_PATH) as conn:
+            cursor = conn.executemany(sql, ((image_hash, image_path, funko_id) for funko_id, image_hash, image_path in images))
+        CollectionEvents.publish(ChangeSet(updated=[funko_id for funko_id, _, _ in images]))
+        return cursor.rowcount
+
+    @staticmethod
+    def has_unstored_images() -> bool:
+        """Cheap startup probe: is there any pop whose photo is not in the ImageStore yet?"""
+        # Same WHERE as idx_funko_pops_unstored_images, so this is an index probe
+        sql = "SELECT 1 FROM funko_pops WHERE image_hash IS NULL AND IFNULL(image_path, '') != '' LIMIT 1"
+        conn = ConnectionManager.get(FunkoDB.DB_PATH)
+        return conn.execute(sql).fetchone() is not None
+
+    @staticmethod
+    def get_unstored_images() -> List[Tuple[int, str]]:
+        """(id, image_path) of pops whose photo has not been copied into the ImageStore yet."""
+        sql = "SELECT id, image_path FROM funko_pops WHERE image_hash IS NULL AND IFNULL(image_path, '') != ''"
+        conn = ConnectionManager.get(FunkoDB.DB_PATH)
+        return conn.execute(sql).fetchall()
 
     @staticmethod
     def delete_funko(funko_id: int):
         print("FunkoDB.delete_funko() was called")
         sql = "DELETE FROM funko_pops WHERE id=?"
-        with sqlite3.connect(FunkoDB.DB_PATH) as conn:
-            cursor = conn.cursor()
-            cursor.execute(sql, (funko_id,))
-            conn.commit()
+        conn = ConnectionManager.get(FunkoDB.DB_PATH)
+        conn.execute(sql, (funko_id,))
+        CollectionEvents.publish(ChangeSet(removed=[funko_id]))
         print(f"Funko with ID {funko_id} deleted from funko_pops.db")
 
+    @staticmethod
+    def delete_funkos(funko_ids: Iterable[int]) -> int:
+        """Delete many Funkos by ID in one transaction. Returns the number of rows deleted."""
+        print("FunkoDB.delete_funkos() was called")
+        sql = "DELETE FROM funko_pops WHERE id=?"
+        funko_ids = list(funko_ids)
+        with ConnectionManager.transaction(FunkoDB.DB_PATH) as conn:
+            cursor = conn.executemany(sql, ((funko_id,) for funko_id in funko_ids))
+        CollectionEvents.publish(ChangeSet(removed=funko_ids))
+        print(f"{cursor.rowcount} Funkos deleted from funko_pops.db")
+        return cursor.rowcount
+
     @staticmethod
     def update_market_value_by_barcode_and_year(barcode: str, year: str, market_value: float):
         print("FunkoDB.update_market_value_by_barcode_and_year() was called")
-        sql = "UPDATE funko_pops SET market_value=? WHERE barcode=? AND year=?"
-        with sqlite3.connect(FunkoDB.DB_PATH) as conn:
-            cursor = conn.cursor()
-            cursor.execute(sql, (market_value, barcode, year))
-            conn.commit()
+        sql = "UPDATE funko_pops SET market_value=? WHERE barcode=? AND year=? RETURNING id"
+        conn = ConnectionManager.get(FunkoDB.DB_PATH)
+        updated = [row[0] for row in conn.execute(sql, (market_value, barcode, year))]
+        CollectionEvents.publish(ChangeSet(updated=updated))
         print(f"Updated market value for barcode {barcode} and year {year} to {market_value}")
 
+    @staticmethod
+    def sync_market_values_from(catalog_path: str, report_size: int = 10) -> SyncReport:
+        """
+        Copy marketValue from the catalog database (firebase_funkos.db) onto every
+        matching (barcode, year) pop and record what moved in sync_reports.
+        The catalog join runs once: every pop is captured with a matched flag and
+        its old and new values in a temp table, which then drives the counts, a
+        primary-key UPDATE ... FROM and the report. Rows whose value is already
+        current are left untouched. The catalog is only read, never write-locked,
+        so a catalog fetch can run at the same time.
+        """
+        print("FunkoDB.sync_market_values_from() was called")
+        match_sql = """
+        INSERT INTO temp.sync_matches (id, name, matched, old_value, new_value)
+        SELECT p.id, p.name, f.barcode IS NOT NULL, p.market_value, f.marketValue FROM funko_pops AS p
+        LEFT JOIN catalog.firebase_funkos AS f ON f.barcode = p.barcode AND f.year = p.year
+        """
+        update_sql = """
+        UPDATE funko_pops SET market_value = m.new_value
+        FROM temp.sync_matches AS m
+        WHERE funko_pops.id = m.id AND m.matched AND m.old_value IS NOT m.new_value
+        RETURNING funko_pops.id
+        """
+        changes_sql = """
+        INSERT INTO sync_report_changes (report_id, funko_id, name, old_value, new_value)
+        SELECT ?, id, name, old_value, new_value FROM temp.sync_matches
+        WHERE matched AND old_value IS NOT new_value
+        """
+        report = SyncReport(synced_at=int(time.time()))
+        with ConnectionManager.attached(FunkoDB.DB_PATH, catalog_path, "catalog"):
+            # Deferred, so only funko_pops.db gets write-locked, not the attached catalog
+            with ConnectionManager.transaction(FunkoDB.DB_PATH, immediate=False) as conn:
+                # Writing the report row first takes funko_pops.db's write lock up front
+                # (waiting out busy_timeout), before anything is read from it
+                report.id = conn.execute(
+                    "INSERT INTO sync_reports (synced_at, matched, changed, unmatched, total_delta) VALUES (?, 0, 0, 0, 0.0)",
+                    (report.synced_at,),
+                ).lastrowid
+                conn.execute("""
+                CREATE TEMP TABLE IF NOT EXISTS sync_matches (
+                    id INTEGER PRIMARY KEY, name TEXT, matched INTEGER, old_value REAL, new_value REAL
+                )
+                """)
+                conn.execute("DELETE FROM temp.sync_matches")
+                conn.execute(match_sql)
+                changed_ids = [row[0] for row in conn.execute(update_sql)]
+
+                report.changed = len(changed_ids)
+                report.matched, report.unmatched, report.total_delta = conn.execute("""
+                    SELECT IFNULL(SUM(matched), 0), IFNULL(SUM(NOT matched), 0),
+                           IFNULL(SUM(CASE WHEN matched THEN IFNULL(new_value, 0) - IFNULL(old_value, 0) END), 0.0)
+                    FROM temp.sync_matches
+                """).fetchone()
+                conn.execute(
+                    "UPDATE sync_reports SET matched = ?, changed = ?, unmatched = ?, total_delta = ? WHERE id = ?",
+                    (report.matched, report.changed, report.unmatched, report.total_delta, report.id),
+                )
+                conn.execute(changes_sql, (report.id,))
+                conn.execute("DELETE FROM temp.sync_matches")
+        report.gainers, report.losers = FunkoDB._report_movers(report.id, report_size)
+        CollectionEvents.publish(ChangeSet(updated=changed_ids))
+        return report
+
+    @staticmethod
+    def get_sync_report(report_id: Optional[int] = None, report_size: int = 10) -> Optional[SyncReport]:
+        """A stored sync report, the latest one by default. None if there is none."""
+        conn = ConnectionManager.get(FunkoDB.DB_PATH)
+        sql = "SELECT id, synced_at, matched, changed, unmatched, total_delta FROM sync_reports"
+        if report_id is None:
+            row = conn.execute(sql + " ORDER BY id DESC LIMIT 1").fetchone()
+        else:
+            row = conn.execute(sql + " WHERE id = ?", (report_id,)).fetchone()
+        if row is None:
+            return None
+        report = SyncReport(*row)
+        report.gainers, report.losers = FunkoDB._report_movers(report.id, report_size)
+        return report
+
+    @staticmethod
+    def _report_movers(report_id: int, limit: int):
+        # Reads only this report's rows (a prefix of the WITHOUT ROWID primary key)
+        sql = """
+        SELECT funko_id, name, old_value, new_value FROM sync_report_changes
+        WHERE report_id = ? AND IFNULL(new_value, 0) - IFNULL(old_value, 0) {op} 0
+        ORDER BY IFNULL(new_value, 0) - IFNULL(old_value, 0) {order}, funko_id
+        LIMIT ?
+        """
+        conn = ConnectionManager.get(FunkoDB.DB_PATH)
+        gainers = conn.execute(sql.format(op=">", order="DESC"), (report_id, limit)).fetchall()
+        losers = conn.execute(sql.format(op="<", order="ASC"), (report_id, limit)).fetchall()
+        return gainers, losers
 
 # Example usage:
 if __name__ == "__main__":
-    FunkoDB.create_table()
+    FunkoDB.migrate()
 
     # Create a Funko object using your classmethods
     new_funko = FunkoPop.from_basic("123456789", "Spider-Man", "Marvel", "001")
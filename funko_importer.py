@@ -0,0 +1,181 @@
+import csv, os, re
+from functools import lru_cache
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from funko_pop import FunkoPop
+from funko_db import FunkoDB
+from db_connection import ConnectionManager
+
+# Result of one FunkoImporter.import_file() run
+@dataclass
+class ImportReport:
+    rows: int = 0            # data rows read from the file
+    imported: int = 0        # pops added to the collection
+    duplicates: int = 0      # rows already in the collection (or earlier in the file)
+    rejected: List[Tuple[int, str, Dict[str, str]]] = field(default_factory=list)   # (line, reason, row)
+    rejected_path: Optional[str] = None   # CSV listing the rejected rows, if there were any
+
+
+# Bulk import of pops from CSV or XLSX into funko_pops.db.
+# Rows are streamed, validated like AddItemDialog, deduplicated on
+# (barcode, year, item_number) and inserted in batched transactions.
+# Qt-free so it can run on a background job or from popkollect.py.
+class FunkoImporter:
+    BATCH_SIZE = 5000
+
+    # Same rules as AddItemDialog's validators
+    BARCODE_PATTERN = re.compile(r"[0-9]{1,15}")
+    YEAR_MAX_LENGTH = 4
+    REQUIRED = ("barcode", "name", "series", "item_number", "year")
+    FLOAT_COLUMNS = ("market_value", "purchase_price")
+
+    # Accepted header spellings besides the FunkoPop field names
+    HEADER_ALIASES = {
+        "item_no": "item_number",
+        "itemno": "item_number",
+        "release_year": "year",
+        "releaseyear": "year",
+        "value": "market_value",
+        "marketvalue": "market_value",
+        "image": "image_path",
+    }
+
+    @staticmethod
+    def import_file(path: str, batch_size: int = BATCH_SIZE, progress=None) -> ImportReport:
+        """
+        Import every row of a .csv or .xlsx file whose header names FunkoPop fields.
+        progress(rows_read, total_rows) is called before each batch is inserted (total 0
+        when unknown), never after the last insert, so a late cancel can't report a
+        finished import as cancelled.
+        Rejected rows are written to <name>_rejected.csv next to the file.
+        """
+        print("FunkoImporter.import_file() was called")
+        report = ImportReport()
+        rows, total = FunkoImporter._read_rows(path)
+        seen = set()
+        batch = []
+
+        for line, raw in rows:
+            report.rows += 1
+            funko, reason = FunkoImporter._to_funko(raw)
+            if funko is None:
+                report.rejected.append((line, reason, raw))
+                continue
+
+            key = (funko.barcode, funko.year, funko.item_number)
+            if key in seen or FunkoImporter._exists(key):
+                report.duplicates += 1
+                continue
+            seen.add(key)
+            batch.append(funko)
+
+            if len(batch) >= batch_size:
+                if progress:
+                    progress(report.rows, total)
+                report.imported += len(FunkoDB.add_funkos(batch))
+                batch = []
+
+        if progress:
+            progress(report.rows, max(total, report.rows))
+        if batch:
+            report.imported += len(FunkoDB.add_funkos(batch))
+
+        if report.rejected:
+            report.rejected_path = FunkoImporter.write_rejected(path, report.rejected)
+        print(f"✅ {report.imported} imported, {report.duplicates} duplicates, ❌ {len(report.rejected)} rejected")
+        return report
+
+    @staticmethod
+    def write_rejected(path: str, rejected) -> str:
+        report_path = os.path.splitext(path)[0] + "_rejected.csv"
+        columns = []
+        for _, _, raw in rejected:
+            columns += [column for column in raw if column not in columns]
+        with open(report_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["line", "reason"] + columns)
+            for line, reason, raw in rejected:
+                writer.writerow([line, reason] + [raw.get(column, "") for column in columns])
+        return report_path
+
+    @staticmethod
+    def _read_rows(path: str) -> Tuple[Iterator[Tuple[int, Dict[str, str]]], int]:
+        # (line number, {header: text}) pairs and the row count if the format knows it
+        extension = os.path.splitext(path)[1].lower()
+        if extension == ".csv":
+            return FunkoImporter._read_csv(path), 0
+        if extension == ".xlsx":
+            from openpyxl import load_workbook
+            workbook = load_workbook(path, read_only=True, data_only=True)
+            sheet = workbook.worksheets[0]
+            total = max((sheet.max_row or 1) - 1, 0)
+            return FunkoImporter._read_sheet(workbook, sheet), total
+        raise ValueError(f"Unsupported import format '{extension}' (use .csv or .xlsx)")
+
+    @staticmethod
+    def _read_csv(path):
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            reader = csv.reader(f)
+            header = next(reader, [])
+            for row in reader:
+                if any(row):
+                    yield reader.line_num, dict(zip(header, row))
+
+    @staticmethod
+    def _read_sheet(workbook, sheet):
+        try:
+            rows = sheet.iter_rows(values_only=True)
+            header = [FunkoImporter._cell_text(value) for value in next(rows, ())]
+            for line, row in enumerate(rows, start=2):
+                if any(value is not None for value in row):
+                    yield line, dict(zip(header, map(FunkoImporter._cell_text, row)))
+        finally:
+            workbook.close()
+
+    @staticmethod
+    def _cell_text(value) -> str:
+        # Excel stores barcodes and years as numbers; 2020.0 should read "2020"
+        if value is None:
+            return ""
+        if isinstance(value, float) and value.is_integer():
+            return str(int(value))
+        return str(value)
+
+    @staticmethod
+    def _to_funko(raw: Dict[str, str]) -> Tuple[Optional[FunkoPop], Optional[str]]:
+        values = {}
+        for header, text in raw.items():
+            column = FunkoImporter._column(header)
+            if column in FunkoDB.WRITE_COLUMNS and column not in ("firestore_id", "image_hash"):
+                values[column] = (text or "").strip() or None
+
+        missing = [column for column in FunkoImporter.REQUIRED if not values.get(column)]
+        if missing:
+            return None, f"missing {', '.join(missing)}"
+        if not FunkoImporter.BARCODE_PATTERN.fullmatch(values["barcode"]):
+            return None, "barcode must be 1-15 digits"
+        if len(values["year"]) > FunkoImporter.YEAR_MAX_LENGTH:
+            return None, f"year longer than {FunkoImporter.YEAR_MAX_LENGTH} characters"
+        for column in FunkoImporter.FLOAT_COLUMNS:
+            if values.get(column) is not None:
+                try:
+                    values[column] = float(values[column].lstrip("$").replace(",", ""))
+                except ValueError:
+                    return None, f"{column} is not a number"
+        if values.get("market_value") is None:
+            values["market_value"] = 0.0
+        return FunkoPop(**values), None
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _column(header) -> str:
+        name = str(header or "").strip().lower().replace(" ", "_")
+        return FunkoImporter.HEADER_ALIASES.get(name, name)
+
+    @staticmethod
+    def _exists(key) -> bool:
+        # Probe of idx_funko_pops_identity
+        conn = ConnectionManager.get(FunkoDB.DB_PATH)
+        sql = "SELECT 1 FROM funko_pops WHERE barcode = ? AND year = ? AND item_number = ? LIMIT 1"
+        return conn.execute(sql, key).fetchone() is not None
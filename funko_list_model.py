@@ -0,0 +1,204 @@
+from bisect import bisect_right
+from typing import List, Optional
+
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex
+from PyQt5.QtGui import QPixmap
+
+from funko_pop import FunkoPop
+from funko_db import FunkoDB
+from collection_events import ChangeSet
+from thumbnail_loader import ThumbnailLoader
+from pixmap_cache import PixmapCache
+
+# List model over the personal collection, shown by Home's QListView
+class FunkoListModel(QAbstractListModel):
+    FunkoRole = Qt.UserRole + 1   # the FunkoPop object behind a row
+
+    THUMBNAIL_SIZE = 80
+    BULK_REMOVE_THRESHOLD = 200
+    PAGE_SIZE = 200
+    SEARCH_LIMIT = 500
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._funkos: List[FunkoPop] = []
+        self._row_by_id = None   # id -> row, rebuilt lazily after rows move
+        self._sort_key = "id"
+        self._filters = None
+        self._cursor = None      # keyset cursor of the next page; None once everything is loaded
+        self._search = None      # active full-text query, if the model shows search results
+        self._loader = ThumbnailLoader(self.THUMBNAIL_SIZE, self)
+        self._loader.thumbnailReady.connect(self._on_thumbnail_ready)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._funkos)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or not 0 <= index.row() < len(self._funkos):
+            return None
+        funko = self._funkos[index.row()]
+
+        if role == Qt.DisplayRole:
+            return funko.name
+        if role == Qt.ToolTipRole:
+            return f"{funko.name} ({funko.series})"
+        if role == Qt.DecorationRole:
+            return self._thumbnail(funko)
+        if role == FunkoListModel.FunkoRole:
+            return funko
+        return None
+
+    def load(self, sort_key: str = "id", filters: Optional[dict] = None):
+        """Reset to the first page of the collection in the given order."""
+        self._sort_key = sort_key
+        self._filters = filters
+        self._search = None
+        funkos, self._cursor = FunkoDB.get_funkos_page(sort_key, None, self.PAGE_SIZE, filters)
+        self.set_funkos(funkos)
+
+    def load_search(self, query: str):
+        """Show the full-text matches for `query` instead of the paged collection."""
+        self._search = query
+        self._cursor = None
+        self.set_funkos(FunkoDB.search(query, self.SEARCH_LIMIT))
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._cursor is not None
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._cursor is None:
+            return
+        funkos, self._cursor = FunkoDB.get_funkos_page(self._sort_key, self._cursor, self.PAGE_SIZE, self._filters)
+        self._append(funkos)
+
+    def set_funkos(self, funkos: List[FunkoPop]):
+        self.beginResetModel()
+        self._funkos = list(funkos)
+        self._row_by_id = None
+        self.endResetModel()
+
+    def row_of(self, funko_id: int) -> int:
+        if self._row_by_id is None:
+            self._row_by_id = {funko.id: row for row, funko in enumerate(self._funkos)}
+        return self._row_by_id.get(funko_id, -1)
+
+    def apply_changes(self, changes: ChangeSet):
+        """
+        Patch only the rows named in `changes`: removed rows are dropped, updated
+        rows are re-read and repainted in place, inserted rows are placed in sort order.
+        Untouched rows (and the view's selection and scroll position) are kept.
+        """
+        if len(changes.removed) > self.BULK_REMOVE_THRESHOLD:
+            # Removing rows one by one re-indexes the tail each time; filter in one go instead
+            removed = set(changes.removed)
+            self.set_funkos([funko for funko in self._funkos if funko.id not in removed])
+            removed_ids = []
+        else:
+            removed_ids = changes.removed
+
+        for funko_id in removed_ids:
+            row = self.row_of(funko_id)
+            if row < 0:
+                continue
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self._funkos[row]
+            self._row_by_id = None
+            self.endRemoveRows()
+
+        for funko in FunkoDB.get_funkos_by_ids(changes.updated):
+            row = self.row_of(funko.id)
+            if row < 0:
+                continue
+            self._funkos[row] = funko
+            index = self.index(row)
+            self.dataChanged.emit(index, index)
+
+        # Search results are a fixed snapshot; new pops show up once the search is cleared
+        inserted_ids = [] if self._search is not None else changes.inserted
+        inserted = [funko for funko in FunkoDB.get_funkos_by_ids(inserted_ids)
+                    if self.row_of(funko.id) < 0 and self._matches_filters(funko)]
+        if inserted:
+            keys = [self._sort_value(funko) for funko in self._funkos]
+            for funko in inserted:
+                # Place the new row in sort order. Rows that sort past the loaded
+                # pages are left for fetchMore to bring in.
+                key = self._sort_value(funko)
+                row = bisect_right(keys, key)
+                if row == len(keys) and self._cursor is not None:
+                    continue
+                self.beginInsertRows(QModelIndex(), row, row)
+                self._funkos.insert(row, funko)
+                keys.insert(row, key)
+                self._row_by_id = None
+                self.endInsertRows()
+        # Updated rows keep their position even if their sort value changed; the next load() re-sorts
+
+    def _append(self, funkos: List[FunkoPop]):
+        if not funkos:
+            return
+        first = len(self._funkos)
+        self.beginInsertRows(QModelIndex(), first, first + len(funkos) - 1)
+        self._funkos.extend(funkos)
+        if self._row_by_id is not None:
+            for offset, funko in enumerate(funkos):
+                self._row_by_id[funko.id] = first + offset
+        self.endInsertRows()
+
+    def shutdown(self):
+        """Stop loading thumbnails (at exit, before the database connections close)."""
+        self._loader.shutdown()
+
+    def _sort_value(self, funko: FunkoPop):
+        # Python mirror of the FunkoDB.SORT_KEYS expressions, tie-broken on id
+        key = self._sort_key.lstrip("-")
+        if key == "market_value":
+            value = funko.market_value or 0.0
+        elif key == "year":
+            value = funko.year or ""
+        else:
+            value = getattr(funko, key)
+        if self._sort_key.startswith("-"):
+            return _Descending((value, funko.id))
+        return (value, funko.id)
+
+    def _matches_filters(self, funko: FunkoPop) -> bool:
+        if not self._filters:
+            return True
+        return all(getattr(funko, column) == value for column, value in self._filters.items())
+
+    def _thumbnail(self, funko: FunkoPop) -> Optional[QPixmap]:
+        # None: no image, or not loaded yet (the delegate draws a placeholder).
+        # Null QPixmap: the image failed to load.
+        if not funko.image_hash and not funko.image_path:
+            return None
+        # Repaints of a tile whose thumbnail is still loading look it up again;
+        # only a lookup that starts a load counts as a cache miss
+        key = ThumbnailLoader.key_for(funko.image_path, funko.image_hash)
+        pixmap = PixmapCache.get(key, self.THUMBNAIL_SIZE, count_miss=False)
+        if pixmap is None:
+            # Only rows that actually get painted ask for a thumbnail
+            if self._loader.request(funko.image_path, funko.image_hash):
+                PixmapCache.record_miss()
+        return pixmap
+
+    def _on_thumbnail_ready(self, key, image):
+        PixmapCache.put(key, self.THUMBNAIL_SIZE, QPixmap.fromImage(image))
+        if self._funkos:
+            # The view only repaints what is on screen
+            self.dataChanged.emit(self.index(0), self.index(len(self._funkos) - 1), [Qt.DecorationRole])
+
+
+# Inverts comparisons so bisect works on descending sort orders
+class _Descending:
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __lt__(self, other):
+        return self.value > other.value
+
+    def __eq__(self, other):
+        return self.value == other.value
@@ -35,15 +35,13 @@
 
 
 
-from dataclasses import dataclass, field
-from typing import Optional
-
-# funko pop class with multiple constructors simulated via classmethods
-class FunkoDB:
-    @staticmethod
-    def update_funko(funko):
-        print(f"[Mock DB] Updating Funko: {funko.name} (ID: {funko.id})")
+from dataclasses import dataclass, field, fields
+from typing import Dict, Optional, Set
 
+# funko pop class with multiple constructors simulated via classmethods.
+# Once loaded from or saved to the database, changes to persisted fields are
+# tracked, so FunkoDB.update_funko and UnitOfWork write only the columns that
+# changed. A FunkoPop built by hand counts every field as changed until saved.
 @dataclass
 class FunkoPop:
     id: int = -1
@@ -59,6 +57,52 @@ class FunkoPop:
     market_value: float = 0.0
     firestore_id: Optional[str] = None
     image_path: Optional[str] = None
+    image_hash: Optional[str] = None   # ImageStore content hash of the photo
+
+    _TRACKED = None   # persisted field names, filled on first use
+
+    def __post_init__(self):
+        # field name -> value before the first change since the last save
+        object.__setattr__(self, "_original", {})
+        # True once the fields are known to match the database row (loaded or saved)
+        object.__setattr__(self, "_synced", False)
+
+    def __setattr__(self, name, value):
+        original = self.__dict__.get("_original")
+        if original is not None and name != "id" and name in FunkoPop._tracked_fields():
+            if name not in original:
+                original[name] = self.__dict__.get(name)
+            elif original[name] == value:
+                # Set back to what was saved: no longer a change
+                del original[name]
+        object.__setattr__(self, name, value)
+
+    @staticmethod
+    def _tracked_fields() -> Set[str]:
+        if FunkoPop._TRACKED is None:
+            FunkoPop._TRACKED = {f.name for f in fields(FunkoPop)} - {"id"}
+        return FunkoPop._TRACKED
+
+    def dirty_fields(self) -> Dict[str, object]:
+        """Persisted fields changed since loading or the last save (all of them if never loaded), with their new values."""
+        if not self._synced:
+            return {f.name: getattr(self, f.name) for f in fields(self) if f.name != "id"}
+        return {name: getattr(self, name) for name, old in self._original.items() if getattr(self, name) != old}
+
+    def is_dirty(self) -> bool:
+        return bool(self.dirty_fields())
+
+    def __copy__(self):
+        # A shallow copy must not share the change record with the original
+        clone = FunkoPop(**{f.name: getattr(self, f.name) for f in fields(self)})
+        clone._original.update(self._original)
+        object.__setattr__(clone, "_synced", self._synced)
+        return clone
+
+    def mark_clean(self):
+        """Forget tracked changes; called once the object matches its database row (loaded or written)."""
+        self._original.clear()
+        object.__setattr__(self, "_synced", True)
 
 
     # Simulating overloaded constructors with classmethods
@@ -98,7 +142,7 @@ class FunkoPop:
             'year': self.year
         }
     
-    # Getters and setters with optional update calls
+    # Getters and setters; changes are saved by FunkoDB.update_funko or a UnitOfWork
     def get_firestore_id(self):
         return self.firestore_id
 
@@ -122,24 +166,18 @@ class FunkoPop:
 
     def set_name(self, name):
         self.name = name
-        FunkoDB.update_funko(self)
-        print(f"Updated Funko Name of ID: {self.id}\n")
 
     def get_series(self):
         return self.series
 
     def set_series(self, series):
         self.series = series
-        FunkoDB.update_funko(self)
-        print(f"Updated Funko Series of ID: {self.id}\n")
 
     def get_item_number(self):
         return self.item_number
 
     def set_item_number(self, item_number):
         self.item_number = item_number
-        FunkoDB.update_funko(self)
-        print(f"Updated Funko Item Number of ID: {self.id}\n")
 
     def get_year(self):
         return self.year
@@ -0,0 +1,119 @@
+import hashlib, os, shutil
+
+from PyQt5.QtCore import QSize, Qt
+from PyQt5.QtGui import QImage, QImageReader
+
+from funko_db import FunkoDB
+
+# App-managed copies of pop photos, addressed by the SHA-1 of their contents.
+# Duplicate photos are stored once. Each image also gets small PNG renditions
+# (80px for the grid tiles, 200px for the sidebar), so display never decodes
+# the original, wherever it came from.
+#
+#   images/ab/abcdef....jpg       the original, copied in
+#   images/ab/abcdef..._80.png    renditions, no larger than size x size
+class ImageStore:
+    DIR = os.path.join(os.getcwd(), "images")
+    RENDITION_SIZES = (80, 200)
+
+    @staticmethod
+    def store(path: str) -> str:
+        """
+        Copy the image at `path` into the store (if it is not there already),
+        build its renditions and return its content hash.
+        Raises OSError if the file cannot be read, ValueError if it is not an image.
+        """
+        content_hash = ImageStore.hash_file(path)
+        folder = os.path.join(ImageStore.DIR, content_hash[:2])
+        os.makedirs(folder, exist_ok=True)
+
+        original = ImageStore.original_path(content_hash)
+        if original is None:
+            extension = os.path.splitext(path)[1].lower() or ".img"
+            original = os.path.join(folder, content_hash + extension)
+            # Copy to a temp name first so a half-copied file is never picked up
+            temp_path = original + ".tmp"
+            shutil.copyfile(path, temp_path)
+            os.replace(temp_path, original)
+
+        for size in ImageStore.RENDITION_SIZES:
+            rendition = ImageStore.rendition_path(content_hash, size)
+            if os.path.exists(rendition):
+                continue
+            image = ImageStore.decode_scaled(original, size)
+            if image.isNull():
+                raise ValueError(f"Not a readable image: {path}")
+            image.save(rendition, "PNG")
+        return content_hash
+
+    @staticmethod
+    def adopt_collection_images(batch_size=100, progress=None) -> int:
+        """
+        Copy the photos of pops added before the store existed into it and point
+        the pops at them. Files that cannot be read right now (moved, removable
+        media) are left for a later run. Returns the number of pops adopted.
+        progress(done, total) is reported before each batch is saved, never after
+        the last one.
+        """
+        pending = FunkoDB.get_unstored_images()
+        adopted, batch = 0, []
+        for done, (funko_id, image_path) in enumerate(pending, start=1):
+            try:
+                content_hash = ImageStore.store(image_path)
+                batch.append((funko_id, content_hash, ImageStore.original_path(content_hash)))
+            except (OSError, ValueError) as e:
+                print(f"Skipping image for pop {funko_id}:", e)
+            if len(batch) >= batch_size or done == len(pending):
+                if progress:
+                    progress(done, len(pending))
+                if batch:
+                    adopted += FunkoDB.set_images(batch)
+                    batch = []
+        return adopted
+
+    @staticmethod
+    def rendition_path(content_hash: str, size: int) -> str:
+        return os.path.join(ImageStore.DIR, content_hash[:2], f"{content_hash}_{size}.png")
+
+    @staticmethod
+    def original_path(content_hash: str):
+        """Path of the stored original, or None if it is not in the store."""
+        folder = os.path.join(ImageStore.DIR, content_hash[:2])
+        if not os.path.isdir(folder):
+            return None
+        for name in os.listdir(folder):
+            stem, extension = os.path.splitext(name)
+            if stem == content_hash and extension != ".tmp":
+                return os.path.join(folder, name)
+        return None
+
+    @staticmethod
+    def load_rendition(content_hash: str, size: int) -> QImage:
+        """The stored rendition closest to `size` (null QImage if missing). Safe on worker threads."""
+        best = min(ImageStore.RENDITION_SIZES, key=lambda s: (s < size, abs(s - size)))
+        image = QImage(ImageStore.rendition_path(content_hash, best))
+        if not image.isNull() and best != size:
+            image = image.scaled(size, size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        return image
+
+    @staticmethod
+    def hash_file(path: str) -> str:
+        digest = hashlib.sha1()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def decode_scaled(path: str, size: int) -> QImage:
+        # Let the decoder scale while reading so the full-resolution image is never built
+        reader = QImageReader(path)
+        reader.setAutoTransform(True)
+        original = reader.size()
+        if original.isValid():
+            reader.setScaledSize(original.scaled(QSize(size, size), Qt.KeepAspectRatio))
+        image = reader.read()
+        if not image.isNull() and (image.width() > size or image.height() > size):
+            # Formats that ignore setScaledSize still come back at full size
+            image = image.scaled(size, size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        return image
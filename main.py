@@ -1,43 +1,103 @@
+from startup_timing import StartupTiming  # first, so the import phase is measured
 import sys, subprocess
 import os # NEW: Import os for file checking
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QFrame, QSplitter, QPushButton,
-    QScrollArea, QDialog, QGridLayout, QSizePolicy, QSpacerItem, QMessageBox
+    QListView, QAbstractItemView, QDialog, QGridLayout, QMessageBox,
+    QProgressBar, QFileDialog, QComboBox, QLineEdit
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QEvent, QObject, QTimer, pyqtSignal
 from PyQt5.QtGui import QPixmap, QIcon # NEW: Import QIcon for the info symbol
 
 # --- Import the separated classes ---
 from funko_pop import FunkoPop
-from clickable_container import ClickableContainer
+from funko_list_model import FunkoListModel
+from pop_tile_delegate import PopTileDelegate
+from sparkline import Sparkline
 from add_item_dialog import AddItemDialog
 from pop_details_dialog import PopDetailsDialog
 from funko_db import FunkoDB
+from image_store import ImageStore
+from pixmap_cache import PixmapCache
+from thumbnail_loader import ThumbnailLoader
 from firebase_db import FirebaseDB
+from db_connection import ConnectionManager
+from collection_events import CollectionEvents
+from background_jobs import JobRunner
 from sync_app import SyncApp
-from sync_firebase import SyncFirebase
+# sync_firebase (Firestore / grpc) and export_sql_excel (openpyxl) are imported
+# when their buttons are first used, not at startup
 
 
-FunkoDB.create_table()  # Ensure the database table exists
-
 # Main Application Window
 class Home(QWidget):
+    # Carries collection ChangeSets from whichever thread wrote them onto the GUI thread
+    collectionChanged = pyqtSignal(object)
+
+    # Background job names (also shown next to the progress bar)
+    FETCH_JOB = "Fetching market values"
+    SYNC_JOB = "Syncing market values"
+    EXPORT_JOB = "Exporting"
+    IMPORT_JOB = "Importing Pops"
+    IMAGES_JOB = "Copying images into the image store"
+
+    # Export file dialog filters -> extension written
+    EXPORT_FORMATS = {
+        "Excel Files (*.xlsx)": ".xlsx",
+        "CSV Files (*.csv)": ".csv",
+        "JSON Lines (*.jsonl)": ".jsonl",
+    }
+
+    # Grid sort options: label -> FunkoDB.get_funkos_page sort key
+    SORT_OPTIONS = {
+        "Date Added": "id",
+        "Name": "name",
+        "Series": "series",
+        "Market Value (High to Low)": "-market_value",
+        "Release Year": "year",
+    }
+
+    # Days of market value history drawn in the sidebar sparkline
+    TREND_DAYS = 90
+
+    # Sidebar image rendition (matches sidebar_image_label)
+    SIDEBAR_IMAGE_SIZE = 200
 
     def __init__(self):
         print("-----Home.__init__() was called-----")
         super().__init__()
         self.setWindowTitle("PopKollect")
-        # Increase initial window width to accommodate 5 columns and sidebars
+        # Initial size only; the grid reflows its columns to whatever width is left
         self.setGeometry(100, 100, 1400, 800) 
         
         self.current_pop = None
-        self.inventory = []
-        self.grid_row = 0
-        self.grid_col = 0
-        self.max_cols = 5
+
+        # Sync and export jobs run here, off the GUI thread
+        self.jobs = JobRunner(self)
+        self.jobs.progress.connect(self.on_job_progress)
+        self.jobs.finished.connect(self.on_job_finished)
+        self.jobs.failed.connect(self.on_job_failed)
+        self.jobs.cancelled.connect(self.on_job_cancelled)
+
         self.initUI()
         self.refresh_ui()
+        StartupTiming.mark("first query")
+
+        # Coalesce bursts of changes into one summary refresh
+        self.summary_timer = QTimer(self)
+        self.summary_timer.setSingleShot(True)
+        self.summary_timer.setInterval(300)
+        self.summary_timer.timeout.connect(self.refresh_summary)
+        self.refresh_summary()
+
+        # Patch the grid from FunkoDB change notifications instead of rebuilding it
+        self.collectionChanged.connect(self.on_collection_changed)
+        CollectionEvents.subscribe(self.collectionChanged.emit)
+
+        # Pops added before the image store existed still point at their original files
+        if FunkoDB.has_unstored_images():
+            self.start_job(self.IMAGES_JOB, ImageStore.adopt_collection_images)
         print("-----Home.__init__() was completed-----")
         
     def setup_info_icon(self, label_widget, tooltip_text):
@@ -113,8 +173,8 @@ class Home(QWidget):
                 padding-top: 11px;
             }
         """)
-        sync_button.setToolTip("Fetches updated market values from the online database (ONE USE PER DAY).")
-        sync_button.clicked.connect(SyncFirebase.sync_firebase)
+        sync_button.setToolTip("Fetches market values that changed in the online database since the last fetch.")
+        sync_button.clicked.connect(self.fetch_market_values)
 
         update_button = QPushButton("Sync Market Values", left_frame)
         update_button.setStyleSheet("""
@@ -135,11 +195,29 @@ class Home(QWidget):
         update_button.setToolTip("Syncs your local collection with the latest market values fetched from the online database.")
         update_button.clicked.connect(self.sync_app)
 
-        export_button = QPushButton("Export to Excel", left_frame)
+        export_button = QPushButton("Export Collection", left_frame)
         export_button.setStyleSheet("background-color: #00A86B; color: white; padding: 8px; border-radius: 5px;")
-        export_button.setToolTip("Export data to Excel File format")
+        export_button.setToolTip("Export data to Excel, CSV or JSON Lines")
         export_button.clicked.connect(self.export_sql_excel)
 
+        import_button = QPushButton("Import Pops", left_frame)
+        import_button.setStyleSheet("background-color: #00A86B; color: white; padding: 8px; border-radius: 5px;")
+        import_button.setToolTip("Add many Pops at once from a CSV or Excel file")
+        import_button.clicked.connect(self.import_funkos)
+
+
+        # Progress of the running background job (hidden while idle)
+        self.job_label = QLabel("", left_frame)
+        self.job_label.setWordWrap(True)
+        self.job_label.setStyleSheet("font-size: 10px; color: #CCC;")
+        self.job_progress = QProgressBar(left_frame)
+        self.job_progress.setTextVisible(False)
+        self.job_progress.setFixedHeight(8)
+        self.job_cancel_button = QPushButton("Cancel", left_frame)
+        self.job_cancel_button.setStyleSheet("background-color: #555; color: white; padding: 4px; border-radius: 5px;")
+        self.job_cancel_button.clicked.connect(self.jobs.cancel_all)
+        for widget in (self.job_label, self.job_progress, self.job_cancel_button):
+            widget.hide()
 
         # Add buttons to the layout
         left_layout.addWidget(logo_label)
@@ -149,37 +227,80 @@ class Home(QWidget):
         left_layout.addWidget(sync_button)
         left_layout.addWidget(update_button)
         left_layout.addWidget(export_button)
+        left_layout.addWidget(import_button)
+        left_layout.addSpacing(15)
+        left_layout.addWidget(self.job_label)
+        left_layout.addWidget(self.job_progress)
+        left_layout.addWidget(self.job_cancel_button)
+
+        # Collection summary (FunkoDB.stats), refreshed after changes
+        self.summary_label = QLabel("", left_frame)
+        self.summary_label.setWordWrap(True)
+        self.summary_label.setTextFormat(Qt.RichText)
+        self.summary_label.setStyleSheet("font-size: 11px; color: #DDD; border-top: 1px solid #555; padding-top: 8px;")
+        left_layout.addSpacing(15)
+        left_layout.addWidget(self.summary_label)
         left_layout.addStretch(1)
 
         main_splitter.addWidget(left_frame)
 
         # --- Section 2: Containers (Middle) ---
         middle_frame = QFrame(self)
-        middle_frame.setMinimumWidth(1250)
+        # The grid reflows to any width; only insist on room for one tile
+        middle_frame.setMinimumWidth(PopTileDelegate.TILE_SIZE.width() + 40)
         middle_frame.setFrameShape(QFrame.StyledPanel)
         middle_frame.setStyleSheet("background-color: #222;")
-        self.scroll_area = QScrollArea(middle_frame)
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        
-        self.scroll_content_widget = QWidget()
-        self.container_grid_layout = QGridLayout(self.scroll_content_widget) 
-        
-        self.container_grid_layout.setContentsMargins(20, 20, 20, 20)
-        self.container_grid_layout.setSpacing(20) 
+        # Virtualized grid: one model row per pop, painted by PopTileDelegate.
+        # Only the tiles in the viewport are ever painted.
+        self.collection_model = FunkoListModel(self)
+        self.collection_view = QListView(middle_frame)
+        self.collection_view.setModel(self.collection_model)
+        self.collection_view.setItemDelegate(PopTileDelegate(self.collection_view))
+        self.collection_view.setViewMode(QListView.IconMode)
+        self.collection_view.setResizeMode(QListView.Adjust)
+        self.collection_view.setMovement(QListView.Static)
+        self.collection_view.setLayoutMode(QListView.Batched)
+        self.collection_view.setUniformItemSizes(True)
+        self.collection_view.setSpacing(10)
+        self.collection_view.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.collection_view.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.collection_view.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.collection_view.setMouseTracking(True)
+        self.collection_view.viewport().setAttribute(Qt.WA_Hover)
+        self.collection_view.setStyleSheet("QListView { background-color: #222; border: none; }")
+        self.collection_view.clicked.connect(self.on_tile_clicked)
+
+        # Page in more rows as the user scrolls near the bottom
+        scroll_bar = self.collection_view.verticalScrollBar()
+        scroll_bar.valueChanged.connect(self.fetch_more_if_needed)
+        scroll_bar.rangeChanged.connect(self.fetch_more_if_needed)
+
+        self.sort_combo = QComboBox(middle_frame)
+        self.sort_combo.addItems(self.SORT_OPTIONS.keys())
+        self.sort_combo.setStyleSheet("background-color: #333; color: white; padding: 4px;")
+        self.sort_combo.currentTextChanged.connect(self.refresh_ui)
+
+        # Search box: filters the grid through FunkoDB.search once typing pauses
+        self.search_input = QLineEdit(middle_frame)
+        self.search_input.setPlaceholderText("Search name, series, item # or barcode...")
+        self.search_input.setClearButtonEnabled(True)
+        self.search_input.setStyleSheet("background-color: #333; color: white; padding: 4px;")
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(200)
+        self.search_timer.timeout.connect(self.refresh_ui)
+        self.search_input.textChanged.connect(self.search_timer.start)
+
+        toolbar_layout = QHBoxLayout()
+        toolbar_layout.addWidget(self.search_input, 1)
+        sort_label = QLabel("Sort by:", middle_frame)
+        sort_label.setStyleSheet("color: white;")
+        toolbar_layout.addWidget(sort_label)
+        toolbar_layout.addWidget(self.sort_combo)
 
-        self.container_grid_layout.addItem(
-            QSpacerItem(0, 0, QSizePolicy.Expanding, QSizePolicy.Fixed),
-            0, self.max_cols, 1, 1
-        )
-        self.container_grid_layout.addItem(
-            QSpacerItem(0, 0, QSizePolicy.Fixed, QSizePolicy.Expanding),
-            999, 0, 1, self.max_cols
-        )
-        self.scroll_content_widget.setLayout(self.container_grid_layout)
-        self.scroll_area.setWidget(self.scroll_content_widget)
         middle_layout = QVBoxLayout(middle_frame)
-        middle_layout.addWidget(self.scroll_area)
+        middle_layout.addLayout(toolbar_layout)
+        middle_layout.addWidget(self.collection_view)
         main_splitter.addWidget(middle_frame)
 
         # --- Section 3: Sidebar (Right - UPDATED to QGridLayout for Details) ---
@@ -196,10 +317,17 @@ class Home(QWidget):
         
         self.sidebar_image_label = QLabel("Click a Pop to see the Image", right_frame)
         self.sidebar_image_label.setAlignment(Qt.AlignCenter)
-        self.sidebar_image_label.setFixedSize(200, 200)
+        self.sidebar_image_label.setFixedSize(self.SIDEBAR_IMAGE_SIZE, self.SIDEBAR_IMAGE_SIZE)
         self.sidebar_image_label.setStyleSheet("border: 1px solid #555;")
         right_layout.addWidget(self.sidebar_image_label)
 
+        # Market value trend from the catalog's value history
+        self.value_sparkline = Sparkline(right_frame)
+        self.value_sparkline.setFixedWidth(380)
+        right_layout.addWidget(self.value_sparkline)
+        self.value_trend_label = QLabel("", right_frame)
+        self.value_trend_label.setStyleSheet("font-size: 11px; color: #DDD;")
+        right_layout.addWidget(self.value_trend_label)
         
         # Details Frame and Grid Layout
         details_frame = QFrame(right_frame)
@@ -322,12 +450,11 @@ class Home(QWidget):
             dialog = PopDetailsDialog(self.current_pop, self)
             result = dialog.exec_()
 
+            # The grid and sidebar are patched by on_collection_changed
             if result == QDialog.Accepted:
                 print("Funko updated!")
-                self.refresh_ui()
             elif result == 99:  # Custom code for deletion
                 print("Funko deleted!")
-                self.refresh_ui()
         else:
             QMessageBox.information(self, "No Pop Selected", "Please select a Funko to edit.")
 #open_edit_pop_dialog ends here
@@ -338,42 +465,29 @@ class Home(QWidget):
         if dialog.exec_() == QDialog.Accepted:
             new_pop = dialog.new_pop
             if new_pop:
-                self.refresh_ui()
+                # FunkoDB.add_funko already announced the new row; just bring it into view
+                row = self.collection_model.row_of(new_pop.id)
+                if row >= 0:
+                    self.collection_view.scrollTo(self.collection_model.index(row))
 #open_add_item_dialog ends here
 
-#add_pop_to_ui starts here
-    def add_pop_to_ui(self, pop_object: FunkoPop):
-        container = ClickableContainer(pop_object, self.scroll_content_widget)
-        container.clicked.connect(self.FBpopChecker)
-        container.clicked.connect(self.display_pop_details)
-        
-
-        self.container_grid_layout.addWidget(
-            container, self.grid_row, self.grid_col
-        )
-
-        self.grid_col += 1
-        if self.grid_col >= self.max_cols:
-            self.grid_col = 0
-            self.grid_row += 1
-#add_pop_to_ui ends here
+#on_tile_clicked starts here
+    def on_tile_clicked(self, index):
+        pop_object = index.data(FunkoListModel.FunkoRole)
+        if pop_object is not None:
+            self.display_pop_details(pop_object)
+#on_tile_clicked ends here
 
 #testFunctionPopFinder
     def FBpopChecker (self, pop_object: FunkoPop):
         print ("----------FBpopCheckerCalled------------")
 
-        firebase_funkos = FirebaseDB.get_all_funkos()
-        current_funkos = pop_object
-        PopFoundInDB = False
-
-        for firebase_funko in firebase_funkos:
-            if current_funkos.barcode == firebase_funko.barcode:
-                if current_funkos.year == firebase_funko.year:
-                    print(current_funkos.name)
-                    PopFoundInDB = True
-                    print ("Pop foound in database")
-                    continue
-        
+        # (barcode, year) is the catalog's primary key, so this is a single index probe
+        PopFoundInDB = FirebaseDB.contains(pop_object.barcode, pop_object.year)
+        if PopFoundInDB:
+            print(pop_object.name)
+            print ("Pop foound in database")
+
         if not PopFoundInDB:
             print("Pop was not found in database")
         return PopFoundInDB
@@ -411,17 +525,14 @@ class Home(QWidget):
         
         self.invis_label.setText(varText)
         # current_barcode = info['barcode']
+
+        self.show_value_trend(pop_object)
         
         
-        if pop_object.image_path:
-            pixmap = QPixmap(pop_object.image_path)
+        if pop_object.image_hash or pop_object.image_path:
+            pixmap = self.sidebar_pixmap(pop_object)
             if not pixmap.isNull():
-                scaled_pixmap = pixmap.scaled(
-                    self.sidebar_image_label.size(),
-                    Qt.KeepAspectRatio,
-                    Qt.SmoothTransformation
-                )
-                self.sidebar_image_label.setPixmap(scaled_pixmap)
+                self.sidebar_image_label.setPixmap(pixmap)
                 self.sidebar_image_label.setStyleSheet("border: 1px solid #555; color: white;")
             else:
                 self.sidebar_image_label.setText("🚫 Image failed to load.")
@@ -432,33 +543,100 @@ class Home(QWidget):
             self.sidebar_image_label.setStyleSheet("color: white; border: 1px solid #555;")
 #display_pop_details ends here
 
+#sidebar_pixmap starts here
+    def sidebar_pixmap(self, pop_object: FunkoPop) -> QPixmap:
+        # Shared cache entry at sidebar size; clicking the same pop again decodes nothing
+        size = self.SIDEBAR_IMAGE_SIZE
+        key = ThumbnailLoader.key_for(pop_object.image_path, pop_object.image_hash)
+        pixmap = PixmapCache.get(key, size)
+        if pixmap is None:
+            if pop_object.image_hash:
+                # Small precomputed rendition instead of the full-size original
+                image = ImageStore.load_rendition(pop_object.image_hash, size)
+            else:
+                image = ImageStore.decode_scaled(pop_object.image_path, size)
+            pixmap = QPixmap.fromImage(image)
+            PixmapCache.put(key, size, pixmap)
+        return pixmap
+#sidebar_pixmap ends here
+
+#show_value_trend starts here
+    def show_value_trend(self, pop_object: FunkoPop):
+        history = FirebaseDB.get_value_history(pop_object.barcode, pop_object.year, self.TREND_DAYS)
+        self.value_sparkline.set_values([value for _, value in history])
+
+        change = FirebaseDB.change_over_days(pop_object.barcode, pop_object.year, 30)
+        if change is None or len(history) < 2:
+            self.value_trend_label.setText("")
+            return
+        old_value, new_value, delta = change
+        self.value_trend_label.setText(f"30-day change: {delta:+,.2f} (${old_value:,.2f} → ${new_value:,.2f})")
+#show_value_trend ends here
+
 #refresh_ui starts here
     def refresh_ui(self):
         print("Home.refresh_ui() was called")
-        # Clear existing widgets from the grid layout
-        while self.container_grid_layout.count():
-            item = self.container_grid_layout.takeAt(0)
-            widget = item.widget()
-            if widget is not None:
-                widget.setParent(None)
-
-        # Reset grid position counters
-        self.grid_row = 0
-        self.grid_col = 0
-
-        # Clear current inventory and fetch fresh data from DB
-        self.inventory = FunkoDB.get_all_funkos()
+        query = self.search_input.text().strip()
+        if query:
+            self.collection_model.load_search(query)
+        else:
+            # Load the first page in the selected order; the rest is paged in on scroll
+            sort_key = self.SORT_OPTIONS[self.sort_combo.currentText()]
+            self.collection_model.load(sort_key)
 
-        # Add all Funkos back to UI grid
-        for funko in self.inventory:
-            self.add_pop_to_ui(funko)
+        self.clear_pop_details()
+#refresh_ui ends here
 
-        # Disable edit/delete buttons after refresh and clear sidebar labels
+#refresh_summary starts here
+    def refresh_summary(self):
+        stats = FunkoDB.stats(top_n=3)
+        lines = [
+            "<b>COLLECTION</b>",
+            f"Pops: {stats.count:,}",
+            f"Total: <b>${stats.total_value:,.2f}</b>",
+            f"Average: ${stats.average_value:,.2f}",
+        ]
+        if stats.top:
+            lines.append("<br><b>Most Valuable</b>")
+            lines += [f"{funko.name}: ${funko.market_value or 0:,.2f}" for funko in stats.top]
+        if stats.by_series:
+            lines.append("<br><b>Top Series</b>")
+            lines += [f"{series}: ${value:,.2f} ({count})" for series, count, value in stats.by_series[:3]]
+        if stats.count:
+            lines.append("<br><b>Value Ranges</b>")
+            lines += [f"{label}: {count}" for label, count in stats.buckets if count]
+        report = FunkoDB.get_sync_report(report_size=3)
+        if report is not None:
+            lines.append("<br><b>Last Sync</b>")
+            lines.append(f"Value change: {report.total_delta:+,.2f} ({report.changed} updated, {report.unmatched} not found)")
+            lines += [f"▲ {name}: {(new or 0) - (old or 0):+,.2f}" for _, name, old, new in report.gainers]
+            lines += [f"▼ {name}: {(new or 0) - (old or 0):+,.2f}" for _, name, old, new in report.losers]
+        movers = FirebaseDB.top_movers(limit=3)
+        if movers:
+            lines.append("<br><b>Top Movers (last fetch)</b>")
+            lines += [f"{name}: {new_value - old_value:+,.2f}" for _, _, name, old_value, new_value in movers]
+        self.summary_label.setText("<br>".join(lines))
+#refresh_summary ends here
+
+#fetch_more_if_needed starts here
+    def fetch_more_if_needed(self, *args):
+        scroll_bar = self.collection_view.verticalScrollBar()
+        # Within one screen of the bottom (or no scroll bar yet): load the next page
+        if scroll_bar.value() >= scroll_bar.maximum() - scroll_bar.pageStep():
+            if self.collection_model.canFetchMore():
+                self.collection_model.fetchMore()
+#fetch_more_if_needed ends here
+
+#clear_pop_details starts here
+    def clear_pop_details(self):
+        # Disable edit/delete buttons and clear sidebar labels
         self.edit_button.setEnabled(False)
         self.delete_button.setEnabled(False)
         self.current_pop = None
         self.sidebar_label.setText("POP DETAILS (Click a Pop)")
         self.sidebar_image_label.clear()
+        self.value_sparkline.set_values([])
+        self.value_trend_label.setText("")
         
         # Reset individual detail labels
         self.barcode_label.setText("Barcode: --")
@@ -467,8 +645,24 @@ class Home(QWidget):
         self.item_number_label.setText("Item Number: --")
         self.year_label.setText("Release Year: --")
         self.value_label.setText("Market Value: --")
-        
-#refresh_ui ends here
+        self.invis_label.setText("")
+#clear_pop_details ends here
+
+#on_collection_changed starts here
+    def on_collection_changed(self, changes):
+        self.collection_model.apply_changes(changes)
+        self.summary_timer.start()
+
+        # Keep the sidebar in step with the selected pop
+        if self.current_pop is None:
+            return
+        if self.current_pop.id in changes.removed:
+            self.clear_pop_details()
+        elif self.current_pop.id in changes.updated:
+            row = self.collection_model.row_of(self.current_pop.id)
+            if row >= 0:
+                self.display_pop_details(self.collection_model.funko_at(row))
+#on_collection_changed ends here
 
 #delete_funko starts here
     def delete_funko(self):
@@ -482,19 +676,19 @@ class Home(QWidget):
             if confirm == QMessageBox.Yes:
                 FunkoDB.delete_funko(self.current_pop.id)
                 print(f"Deleted: {self.current_pop.name}")
-                self.current_pop = None
-                self.edit_button.setEnabled(False)
-                self.delete_button.setEnabled(False)
-                self.refresh_ui()
         else:
             QMessageBox.information(self, "No Pop Selected", "Please select a Funko to delete.")
 #delete_funko ends
 
+# fetch_market_values starts here
+    def fetch_market_values(self):
+        print("Home.fetch_market_values() was called")
+        from sync_firebase import SyncFirebase
+        self.start_job(self.FETCH_JOB, SyncFirebase.sync_firebase)
+# fetch_market_values ends here
+
 # sync_app starts here
     def sync_app(self):
-        import os
-        from PyQt5.QtWidgets import QMessageBox
-
         DB_FILE_NAME = "firebase_funkos.db"
         
         print("Update button clicked")
@@ -510,51 +704,133 @@ class Home(QWidget):
             print(f"Error: {DB_FILE_NAME} not found. Update aborted.")
             return # Stop execution if the file is missing
 
-        # CHECK 2 (Optional but recommended): Check for internet connection if possible before proceeding
-        # (Assuming SyncApp.sync_market_values() handles the actual internet connection check)
-
-        # 3. If the file is found, proceed with the update logic
-        SyncApp.sync_market_values()
-        
-        self.refresh_ui()
-        print("----- Home.sync_app() has completed. -----")
+        # 2. If the file is found, run the update in the background; the grid is
+        # patched through collection change notifications as rows change
+        self.start_job(self.SYNC_JOB, SyncApp.sync_market_values)
 # sync_app ends here
 
 # export_sql_excel starts here
     def export_sql_excel(self):
-        import sqlite3
-        import pandas as pd
-        from PyQt5.QtWidgets import QFileDialog, QMessageBox
-
-        try:
-            conn = sqlite3.connect("funko_pops.db")
-            tables = pd.read_sql_query("SELECT name FROM sqlite_master WHERE type='table';", conn)
+        file_path, selected_filter = QFileDialog.getSaveFileName(
+            self, "Export Collection", "", ";;".join(self.EXPORT_FORMATS)
+        )
+        if not file_path:
+            return
+        extension = self.EXPORT_FORMATS.get(selected_filter, ".xlsx")
+        if not file_path.lower().endswith(extension):
+            file_path += extension
+        from export_sql_excel import export_tables
+        # Only once it starts: a refused second export must not relabel the running one
+        if self.start_job(self.EXPORT_JOB, export_tables, FunkoDB.DB_PATH, file_path):
+            self.export_path = file_path
+# export_sql_excel ends here
 
-            if tables.empty:
+# import_funkos starts here
+    def import_funkos(self):
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "Import Pops", "", "Spreadsheets (*.csv *.xlsx);;CSV Files (*.csv);;Excel Files (*.xlsx)"
+        )
+        if not file_path:
+            return
+        # New pops reach the grid through collection change notifications, batch by batch
+        from funko_importer import FunkoImporter
+        self.start_job(self.IMPORT_JOB, FunkoImporter.import_file, file_path)
+# import_funkos ends here
+
+# background jobs start here
+    def start_job(self, name, func, *args, **kwargs) -> bool:
+        if not self.jobs.start(name, func, *args, **kwargs):
+            QMessageBox.information(self, "Please Wait", f"{name} is already in progress.")
+            return False
+        self.job_label.setText(f"{name}...")
+        self.job_progress.setRange(0, 0)  # busy until the first progress report
+        for widget in (self.job_label, self.job_progress, self.job_cancel_button):
+            widget.show()
+        return True
+
+    def on_job_progress(self, name, done, total):
+        if total > 0:
+            self.job_progress.setRange(0, total)
+            self.job_progress.setValue(done)
+        else:
+            self.job_label.setText(f"{name}... {done:,}")
+
+    def on_job_finished(self, name, result):
+        self.hide_job_progress()
+        if name == self.SYNC_JOB:
+            lines = [
+                f"{result.matched} Pops matched the online database ({result.changed} updated).",
+                f"{result.unmatched} Pops were not found.",
+                f"Collection value change: {result.total_delta:+,.2f}",
+            ]
+            if result.gainers:
+                lines.append("\nBiggest gainers:")
+                lines += [f"  {name}: ${old or 0:,.2f} → ${new or 0:,.2f}" for _, name, old, new in result.gainers[:5]]
+            if result.losers:
+                lines.append("\nBiggest losers:")
+                lines += [f"  {name}: ${old or 0:,.2f} → ${new or 0:,.2f}" for _, name, old, new in result.losers[:5]]
+            self.refresh_summary()
+            QMessageBox.information(self, "Sync Complete", "\n".join(lines))
+        elif name == self.FETCH_JOB:
+            self.refresh_summary()
+            QMessageBox.information(self, "Fetch Complete", f"{result} market values were fetched.")
+        elif name == self.EXPORT_JOB:
+            if result == 0:
                 QMessageBox.warning(self, "No Tables Found", "The database contains no tables.")
-                conn.close()
-                return
-
-            file_path, _ = QFileDialog.getSaveFileName(self, "Save Excel File", "", "Excel Files (*.xlsx)")
-
-            if not file_path:
-                conn.close()
-                return
-
-            with pd.ExcelWriter(file_path, engine='openpyxl') as writer:
-                for table_name in tables['name']:
-                    df = pd.read_sql_query(f"SELECT * FROM {table_name}", conn)
-                    df.to_excel(writer, sheet_name=table_name, index=False)
-
-            conn.close()
-            QMessageBox.information(self, "Export to Excel is Successful", f"Check your Excel file here:\n{file_path}")
-
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"An error occurred:\n{e}")
-# export_sql_excel ends here
+            else:
+                if self.export_path.lower().endswith(".xlsx"):
+                    location = self.export_path
+                else:
+                    # CSV / JSON Lines exports write one file per table next to the chosen path
+                    location = os.path.dirname(self.export_path) or os.getcwd()
+                QMessageBox.information(self, "Export Successful", f"{result} tables exported. Check your files here:\n{location}")
+
+        elif name == self.IMPORT_JOB:
+            message = (
+                f"{result.imported} Pops imported.\n"
+                f"{result.duplicates} were already in your collection."
+            )
+            if result.rejected:
+                message += f"\n{len(result.rejected)} rows were rejected; see:\n{result.rejected_path}"
+            QMessageBox.information(self, "Import Complete", message)
+
+    def on_job_failed(self, name, message):
+        self.hide_job_progress()
+        QMessageBox.critical(self, "Error", f"{name} failed:\n{message}")
+
+    def on_job_cancelled(self, name):
+        self.hide_job_progress()
+        print(f"{name} was cancelled")
+
+    def hide_job_progress(self):
+        if self.jobs.running_jobs():
+            self.job_label.setText(f"{self.jobs.running_jobs()[0]}...")
+            return
+        for widget in (self.job_label, self.job_progress, self.job_cancel_button):
+            widget.hide()
+
+    def closeEvent(self, event):
+        # Let running jobs roll back cleanly before the connections are closed
+        self.jobs.cancel_all()
+        self.jobs.wait(5000)
+        self.collection_model.shutdown()
+        print("Pixmap cache:", PixmapCache.stats())
+        super().closeEvent(event)
+# background jobs end here
+
+
+# Records "first paint" the first time the collection grid is drawn
+class _FirstPaintWatcher(QObject):
+    def eventFilter(self, watched, event):
+        if event.type() == QEvent.Paint:
+            watched.removeEventFilter(self)
+            StartupTiming.mark("first paint")
+            StartupTiming.report()
+        return False
 
 
 if __name__ == "__main__":
+    StartupTiming.mark("imports")
     app = QApplication(sys.argv)
 
     app.setStyleSheet("""
@@ -568,6 +844,15 @@ if __name__ == "__main__":
     """)
 
 
+    app.aboutToQuit.connect(ConnectionManager.close_all)
+
+    FunkoDB.migrate()  # Bring funko_pops.db up to the current schema, once per launch
+    StartupTiming.mark("db open")
+
     main_window = Home()
+    StartupTiming.mark("window built")
+    if StartupTiming.enabled:
+        first_paint_watcher = _FirstPaintWatcher()
+        main_window.collection_view.viewport().installEventFilter(first_paint_watcher)
     main_window.show()
     sys.exit(app.exec_())
\ No newline at end of file
@@ -0,0 +1,168 @@
+from db_connection import ConnectionManager
+
+# Versioned schema migrations for funko_pops.db.
+# The database's PRAGMA user_version records the last step applied; each step
+# runs once, in order, inside its own transaction together with the version bump.
+# Add new steps to the end of MIGRATIONS; never edit or reorder existing ones.
+
+def _create_funko_pops(conn):
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS funko_pops (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        barcode TEXT,
+        name TEXT NOT NULL,
+        series TEXT NOT NULL,
+        item_number TEXT NOT NULL,
+        market_value REAL,
+        year TEXT,
+        image_path TEXT
+    );
+    """)
+
+
+def _add_sort_indexes(conn):
+    # (sort expression, id) indexes for FunkoDB.get_funkos_page; the expressions
+    # must match FunkoDB.SORT_KEYS exactly for SQLite to use them
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_funko_pops_name ON funko_pops(name, id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_funko_pops_series ON funko_pops(series, id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_funko_pops_market_value ON funko_pops(IFNULL(market_value, 0), id)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_funko_pops_year ON funko_pops(IFNULL(year, ''), id)")
+
+
+def _add_full_text_search(conn):
+    # External-content FTS5 table over the searchable columns, kept in sync by triggers
+    fts_exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'funko_pops_fts'"
+    ).fetchone()
+    if not fts_exists:
+        conn.execute("""
+        CREATE VIRTUAL TABLE funko_pops_fts USING fts5(
+            name, series, item_number, barcode,
+            content='funko_pops', content_rowid='id', prefix='2 3'
+        );
+        """)
+        # Index the rows that existed before search was added
+        conn.execute("INSERT INTO funko_pops_fts(funko_pops_fts) VALUES ('rebuild')")
+
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS funko_pops_fts_ai AFTER INSERT ON funko_pops BEGIN
+        INSERT INTO funko_pops_fts(rowid, name, series, item_number, barcode)
+        VALUES (new.id, new.name, new.series, new.item_number, new.barcode);
+    END
+    """)
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS funko_pops_fts_ad AFTER DELETE ON funko_pops BEGIN
+        INSERT INTO funko_pops_fts(funko_pops_fts, rowid, name, series, item_number, barcode)
+        VALUES ('delete', old.id, old.name, old.series, old.item_number, old.barcode);
+    END
+    """)
+    conn.execute("""
+    CREATE TRIGGER IF NOT EXISTS funko_pops_fts_au AFTER UPDATE OF name, series, item_number, barcode ON funko_pops BEGIN
+        INSERT INTO funko_pops_fts(funko_pops_fts, rowid, name, series, item_number, barcode)
+        VALUES ('delete', old.id, old.name, old.series, old.item_number, old.barcode);
+        INSERT INTO funko_pops_fts(rowid, name, series, item_number, barcode)
+        VALUES (new.id, new.name, new.series, new.item_number, new.barcode);
+    END
+    """)
+
+
+def _add_funko_pop_fields(conn):
+    # Columns FunkoPop already carries but the table never stored
+    existing = {row[1] for row in conn.execute("PRAGMA table_info(funko_pops)")}
+    for column, column_type in (
+        ("variant", "TEXT"),
+        ("exclusive", "TEXT"),
+        ("condition", "TEXT"),
+        ("purchase_price", "REAL"),
+        ("firestore_id", "TEXT"),
+    ):
+        if column not in existing:
+            conn.execute(f"ALTER TABLE funko_pops ADD COLUMN {column} {column_type}")
+
+
+def _add_sync_key_index(conn):
+    # Covers the market-value sync join: lookup on (barcode, year), reads market_value
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_funko_pops_sync ON funko_pops(barcode, year, market_value)")
+
+
+def _add_sync_reports(conn):
+    # One row per "Sync Market Values" run, plus the pops whose value it moved.
+    # The name is copied so old reports still read well after a pop is deleted.
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS sync_reports (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        synced_at INTEGER NOT NULL,
+        matched INTEGER NOT NULL,
+        changed INTEGER NOT NULL,
+        unmatched INTEGER NOT NULL,
+        total_delta REAL NOT NULL
+    );
+    """)
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS sync_report_changes (
+        report_id INTEGER NOT NULL,
+        funko_id INTEGER NOT NULL,
+        name TEXT,
+        old_value REAL,
+        new_value REAL,
+        PRIMARY KEY (report_id, funko_id)
+    ) WITHOUT ROWID;
+    """)
+
+
+def _add_identity_index(conn):
+    # Duplicate check used by FunkoImporter: is (barcode, year, item_number) already collected?
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_funko_pops_identity ON funko_pops(barcode, year, item_number)")
+
+
+def _add_image_hash(conn):
+    # ImageStore content hash; image_path is kept for pops added before the store existed
+    existing = {row[1] for row in conn.execute("PRAGMA table_info(funko_pops)")}
+    if "image_hash" not in existing:
+        conn.execute("ALTER TABLE funko_pops ADD COLUMN image_hash TEXT")
+
+
+def _add_unstored_images_index(conn):
+    # Partial index of pops still waiting for ImageStore adoption, so the startup
+    # probe (FunkoDB.has_unstored_images) doesn't scan the table once all are adopted.
+    # Queries must repeat this WHERE clause exactly for SQLite to use it.
+    conn.execute("""
+    CREATE INDEX IF NOT EXISTS idx_funko_pops_unstored_images ON funko_pops(id)
+    WHERE image_hash IS NULL AND IFNULL(image_path, '') != ''
+    """)
+
+
+# (version, description, step) in the order they must be applied
+MIGRATIONS = [
+    (1, "create funko_pops", _create_funko_pops),
+    (2, "sort indexes", _add_sort_indexes),
+    (3, "full-text search", _add_full_text_search),
+    (4, "variant/exclusive/condition/purchase_price/firestore_id columns", _add_funko_pop_fields),
+    (5, "sync key index", _add_sync_key_index),
+    (6, "sync reports", _add_sync_reports),
+    (7, "import duplicate-check index", _add_identity_index),
+    (8, "image_hash column", _add_image_hash),
+    (9, "unstored images index", _add_unstored_images_index),
+]
+
+
+class Migrations:
+    @staticmethod
+    def current_version(path) -> int:
+        conn = ConnectionManager.get(path)
+        return conn.execute("PRAGMA user_version").fetchone()[0]
+
+    @staticmethod
+    def migrate(path, migrations=MIGRATIONS) -> int:
+        """Apply every step newer than the database's user_version. Returns the final version."""
+        version = Migrations.current_version(path)
+        for target, description, step in migrations:
+            if target <= version:
+                continue
+            print(f"Migrating {path} to version {target}: {description}")
+            with ConnectionManager.transaction(path) as conn:
+                step(conn)
+                # PRAGMA does not accept bound parameters; target is an int from the table above
+                conn.execute(f"PRAGMA user_version = {int(target)}")
+            version = target
+        return version
@@ -0,0 +1,90 @@
+import os
+from collections import OrderedDict
+
+from PyQt5.QtGui import QPixmap
+
+# Decoded pixmaps shared by the grid tiles and the sidebar, keyed by
+# (image key, size) so the 80px tile and the 200px sidebar copies of one
+# photo are separate entries. Least recently used entries are evicted once
+# the cache holds more than BUDGET_BYTES of pixel data.
+# A null QPixmap can be cached to remember that an image failed to load.
+# QPixmap is GUI-thread only, so this cache is too.
+class PixmapCache:
+    BUDGET_BYTES = int(os.environ.get("POPKOLLECT_PIXMAP_CACHE_MB", "64")) * 1024 * 1024
+
+    _entries = OrderedDict()   # (key, size) -> QPixmap, least recently used first
+    _bytes = 0
+    hits = 0
+    misses = 0
+    evictions = 0
+
+    @staticmethod
+    def get(key: str, size: int, count_miss: bool = True):
+        """
+        The cached pixmap for (key, size), or None on a miss.
+        Callers that look the same key up repeatedly while it loads pass
+        count_miss=False and call record_miss() once when they start the load.
+        """
+        pixmap = PixmapCache._entries.get((key, size))
+        if pixmap is None:
+            if count_miss:
+                PixmapCache.misses += 1
+            return None
+        PixmapCache._entries.move_to_end((key, size))
+        PixmapCache.hits += 1
+        return pixmap
+
+    @staticmethod
+    def record_miss():
+        PixmapCache.misses += 1
+
+    @staticmethod
+    def put(key: str, size: int, pixmap: QPixmap):
+        PixmapCache.discard(key, size)
+        PixmapCache._entries[(key, size)] = pixmap
+        PixmapCache._bytes += PixmapCache._cost(pixmap)
+        PixmapCache._evict()
+
+    @staticmethod
+    def discard(key: str, size: int):
+        pixmap = PixmapCache._entries.pop((key, size), None)
+        if pixmap is not None:
+            PixmapCache._bytes -= PixmapCache._cost(pixmap)
+
+    @staticmethod
+    def set_budget(budget_bytes: int):
+        PixmapCache.BUDGET_BYTES = budget_bytes
+        PixmapCache._evict()
+
+    @staticmethod
+    def clear():
+        PixmapCache._entries.clear()
+        PixmapCache._bytes = 0
+
+    @staticmethod
+    def stats() -> dict:
+        lookups = PixmapCache.hits + PixmapCache.misses
+        return {
+            "entries": len(PixmapCache._entries),
+            "bytes": PixmapCache._bytes,
+            "budget_bytes": PixmapCache.BUDGET_BYTES,
+            "hits": PixmapCache.hits,
+            "misses": PixmapCache.misses,
+            "evictions": PixmapCache.evictions,
+            "hit_rate": PixmapCache.hits / lookups if lookups else 0.0,
+        }
+
+    @staticmethod
+    def _cost(pixmap: QPixmap) -> int:
+        # Null pixmaps still take an entry; count them as one byte so they can age out
+        if pixmap.isNull():
+            return 1
+        return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+    @staticmethod
+    def _evict():
+        # Always keep the newest entry, even if it alone is over budget
+        while PixmapCache._bytes > PixmapCache.BUDGET_BYTES and len(PixmapCache._entries) > 1:
+            _, pixmap = PixmapCache._entries.popitem(last=False)
+            PixmapCache._bytes -= PixmapCache._cost(pixmap)
+            PixmapCache.evictions += 1
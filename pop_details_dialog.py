@@ -58,12 +58,17 @@ class PopDetailsDialog(QDialog):
         self.cancel_btn.clicked.connect(self.reject)  # Just close dialog without saving
 
     def save_changes(self):
-        # Save changes to the funko object and database
-        self.funko.barcode = self.barcode_field.text()
-        self.funko.name = self.name_field.text()
-        self.funko.series = self.series_field.text()
-        self.funko.item_number = self.item_number_field.text()
-        self.funko.year = self.year_field.text()
+        # Save changes to the funko object and database. Only fields whose text was
+        # edited are assigned, so update_funko writes just those columns.
+        for attribute, field in (
+            ("barcode", self.barcode_field),
+            ("name", self.name_field),
+            ("series", self.series_field),
+            ("item_number", self.item_number_field),
+            ("year", self.year_field),
+        ):
+            if field.text() != (getattr(self.funko, attribute) or ""):
+                setattr(self.funko, attribute, field.text())
         self.funko.market_value = float(self.value_field.text())
 
         FunkoDB.update_funko(self.funko)
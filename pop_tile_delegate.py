@@ -0,0 +1,74 @@
+from PyQt5.QtWidgets import QStyledItemDelegate, QStyle
+from PyQt5.QtCore import Qt, QRect, QRectF, QSize
+from PyQt5.QtGui import QColor, QFont, QPainter, QPainterPath, QPen
+
+from funko_list_model import FunkoListModel
+
+# Paints one collection tile. Looks like the old ClickableContainer widget,
+# but only the tiles currently visible in the QListView are ever painted.
+class PopTileDelegate(QStyledItemDelegate):
+    TILE_SIZE = QSize(220, 150)
+    IMAGE_SIZE = 80
+    PADDING = 8
+
+    BACKGROUND = QColor("#444")
+    BACKGROUND_HOVER = QColor("#555")
+    BORDER = QColor("#666")
+    BORDER_SELECTED = QColor("#FFFF00")
+
+    def sizeHint(self, option, index):
+        return self.TILE_SIZE
+
+    def paint(self, painter, option, index):
+        funko = index.data(FunkoListModel.FunkoRole)
+        if funko is None:
+            return
+
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+
+        # --- Frame ---
+        rect = QRectF(option.rect).adjusted(0.5, 0.5, -0.5, -0.5)
+        path = QPainterPath()
+        path.addRoundedRect(rect, 5, 5)
+        hovered = bool(option.state & QStyle.State_MouseOver)
+        selected = bool(option.state & QStyle.State_Selected)
+        painter.fillPath(path, self.BACKGROUND_HOVER if hovered else self.BACKGROUND)
+        painter.setPen(QPen(self.BORDER_SELECTED if selected else self.BORDER, 2 if selected else 1))
+        painter.drawPath(path)
+
+        inner = option.rect.adjusted(self.PADDING, self.PADDING, -self.PADDING, -self.PADDING)
+
+        # --- Image ---
+        image_rect = QRect(inner.x(), inner.y(), inner.width(), self.IMAGE_SIZE)
+        pixmap = index.data(Qt.DecorationRole)
+        if pixmap is None:
+            # Placeholder for no image, or while the thumbnail is still loading
+            self._draw_text(painter, image_rect, "👤", QColor("#BBB"), 30)
+        elif pixmap.isNull():
+            # Fallback if image path is bad or file corrupted
+            self._draw_text(painter, image_rect, "🚫 IMG LOAD FAILED", QColor("red"), 10)
+        else:
+            x = image_rect.x() + (image_rect.width() - pixmap.width()) // 2
+            y = image_rect.y() + (image_rect.height() - pixmap.height()) // 2
+            painter.drawPixmap(x, y, pixmap)
+
+        # --- Labels ---
+        y = image_rect.bottom() + 2
+        name_rect = QRect(inner.x(), y, inner.width(), 20)
+        series_rect = QRect(inner.x(), y + 20, inner.width(), 14)
+        value_rect = QRect(inner.x(), y + 34, inner.width(), 18)
+        self._draw_text(painter, name_rect, funko.name, QColor("white"), 14, bold=True)
+        self._draw_text(painter, series_rect, f"Series: {funko.series}", QColor("#AAA"), 10)
+        self._draw_text(painter, value_rect, f"Value: ${funko.market_value or 0.0:.2f}", QColor("#add8e6"), 12, bold=True)
+
+        painter.restore()
+
+    def _draw_text(self, painter, rect, text, color, pixel_size, bold=False):
+        font = QFont(painter.font())
+        font.setPixelSize(pixel_size)
+        font.setBold(bold)
+        painter.setFont(font)
+        painter.setPen(color)
+        elided = painter.fontMetrics().elidedText(text or "", Qt.ElideRight, rect.width())
+        painter.drawText(rect, Qt.AlignCenter, elided)
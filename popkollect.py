@@ -0,0 +1,106 @@
+import argparse, contextlib, json, sys, time
+from dataclasses import asdict
+
+from funko_db import FunkoDB
+from db_connection import ConnectionManager
+
+# Headless entry point for cron jobs and scripts. No Qt is imported here, and the
+# Firestore client is only imported by fetch-catalog.
+# Library progress messages go to stderr; stdout carries one JSON summary per run.
+#
+#   python popkollect.py fetch-catalog [--full]
+#   python popkollect.py sync-values
+#   python popkollect.py export funko_pops.xlsx
+#   python popkollect.py stats [--top 5]
+#   python popkollect.py import pops.csv|pops.xlsx
+
+def fetch_catalog(args):
+    from sync_firebase import SyncFirebase
+    total = SyncFirebase.sync_firebase(full=args.full)
+    return {"fetched": total}
+
+
+def sync_values(args):
+    from sync_app import SyncApp
+    report = SyncApp.sync_market_values()
+    return asdict(report)
+
+
+def export(args):
+    from export_sql_excel import export_tables
+    tables = export_tables(args.db or FunkoDB.DB_PATH, args.file, progress=_log_progress)
+    return {"file": args.file, "tables": tables}
+
+
+def _log_progress(done, total):
+    if total and done and (done == total or done % 100000 == 0):
+        print(f"{done:,} / {total:,} rows", file=sys.stderr)
+
+
+def stats(args):
+    return asdict(FunkoDB.stats(top_n=args.top))
+
+
+def import_file(args):
+    from funko_importer import FunkoImporter
+    report = FunkoImporter.import_file(args.file, progress=_log_progress)
+    return {
+        "file": args.file,
+        "rows": report.rows,
+        "imported": report.imported,
+        "duplicates": report.duplicates,
+        "rejected": len(report.rejected),
+        "rejected_path": report.rejected_path,
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="popkollect", description="PopKollect without the GUI")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    fetch_parser = commands.add_parser("fetch-catalog", help="download catalog market values into firebase_funkos.db")
+    fetch_parser.add_argument("--full", action="store_true", help="ignore the high-water mark and fetch everything")
+    fetch_parser.set_defaults(func=fetch_catalog)
+
+    sync_parser = commands.add_parser("sync-values", help="copy catalog market values onto the collection")
+    sync_parser.set_defaults(func=sync_values)
+
+    export_parser = commands.add_parser("export", help="export every table of the collection database")
+    export_parser.add_argument("file", help="output .xlsx, .csv or .jsonl file (csv/jsonl: one file per table)")
+    export_parser.add_argument("--db", help=f"database to export (default {FunkoDB.DB_PATH})")
+    export_parser.set_defaults(func=export)
+
+    stats_parser = commands.add_parser("stats", help="collection totals and breakdowns")
+    stats_parser.add_argument("--top", type=int, default=5, help="number of most valuable pops to list")
+    stats_parser.set_defaults(func=stats)
+
+    import_parser = commands.add_parser("import", help="add pops from a CSV or XLSX file")
+    import_parser.add_argument("file", help=".csv or .xlsx with a header row of FunkoPop field names")
+    import_parser.set_defaults(func=import_file)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    started = time.perf_counter()
+    try:
+        # Keep stdout clean for the JSON summary
+        with contextlib.redirect_stdout(sys.stderr):
+            FunkoDB.migrate()
+            result = args.func(args)
+        status = 0
+        output = {"command": args.command, "ok": True, **result}
+    except Exception as e:
+        status = 1
+        output = {"command": args.command, "ok": False, "error": f"{type(e).__name__}: {e}"}
+    finally:
+        ConnectionManager.close_all()
+
+    output["seconds"] = round(time.perf_counter() - started, 3)
+    print(json.dumps(output, default=str))
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,51 @@
+from typing import List
+
+from PyQt5.QtWidgets import QWidget
+from PyQt5.QtCore import Qt, QPointF
+from PyQt5.QtGui import QColor, QPainter, QPen, QPolygonF
+
+# Small market value trend line for the sidebar. Hidden until it has two points to join.
+class Sparkline(QWidget):
+    RISING = QColor("#4CAF50")
+    FALLING = QColor("#F44336")
+    FLAT = QColor("#AAAAAA")
+    PADDING = 3
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._values: List[float] = []
+        self.setFixedHeight(40)
+        self.hide()
+
+    def set_values(self, values: List[float]):
+        self._values = [float(value) for value in values if value is not None]
+        self.setVisible(len(self._values) >= 2)
+        self.update()
+
+    def paintEvent(self, event):
+        if len(self._values) < 2:
+            return
+
+        low, high = min(self._values), max(self._values)
+        span = (high - low) or 1.0
+        width = self.width() - 2 * self.PADDING
+        height = self.height() - 2 * self.PADDING
+        step = width / (len(self._values) - 1)
+
+        points = QPolygonF([
+            QPointF(self.PADDING + i * step, self.PADDING + height - (value - low) / span * height)
+            for i, value in enumerate(self._values)
+        ])
+
+        if self._values[-1] > self._values[0]:
+            color = self.RISING
+        elif self._values[-1] < self._values[0]:
+            color = self.FALLING
+        else:
+            color = self.FLAT
+
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(QPen(color, 1.5, Qt.SolidLine, Qt.RoundCap, Qt.RoundJoin))
+        painter.drawPolyline(points)
+        painter.end()
@@ -0,0 +1,33 @@
+import os, sys, time
+
+# Cold-start timing for main.py. Enabled with POPKOLLECT_STARTUP_TIMING=1 or the
+# --startup-timing flag; otherwise mark() and report() do nothing.
+# Each mark records the time since the previous one, so the report reads as a
+# breakdown: imports, DB open, first query, window built, first paint.
+class StartupTiming:
+    ENV_VAR = "POPKOLLECT_STARTUP_TIMING"
+    FLAG = "--startup-timing"
+
+    enabled = os.environ.get(ENV_VAR, "") not in ("", "0") or FLAG in sys.argv
+    _started = time.perf_counter()
+    _last = _started
+    _marks = []   # (label, seconds since previous mark)
+
+    @staticmethod
+    def mark(label: str):
+        if not StartupTiming.enabled:
+            return
+        now = time.perf_counter()
+        StartupTiming._marks.append((label, now - StartupTiming._last))
+        StartupTiming._last = now
+
+    @staticmethod
+    def report():
+        """Print the breakdown to stderr (stdout is full of app logging)."""
+        if not StartupTiming.enabled or not StartupTiming._marks:
+            return
+        total = StartupTiming._last - StartupTiming._started
+        print("----- Startup timing -----", file=sys.stderr)
+        for label, seconds in StartupTiming._marks:
+            print(f"{label:<16}{seconds * 1000:8.1f} ms", file=sys.stderr)
+        print(f"{'total':<16}{total * 1000:8.1f} ms", file=sys.stderr)
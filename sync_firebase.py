@@ -1,25 +1,56 @@
+import time
+from datetime import datetime
+
 from firebase_db import FirebaseDB
-from firestore_connection import FirestoreConnection
+from db_connection import ConnectionManager
 
 # Sync Firebase funkos into local firebase_funkos.db
 class SyncFirebase:
-    def sync_firebase():
+    COLLECTION = "funkos"
+
+    def sync_firebase(full=False, batch_size=1000, page_size=500, progress=None):
+        """
+        Pull the catalog into firebase_funkos.db. After the first run only documents
+        whose updatedAt is at or past the stored high-water mark are fetched;
+        pass full=True to re-download the whole collection.
+        """
         # 1. Ensure local DB table exists
         FirebaseDB.create_table()
         print("✅ Ensured firebase_funkos.db table exists"  )
 
-        # 2. Fetch funkos from Firebase
+        high_water = None if full else FirebaseDB.get_high_water(SyncFirebase.COLLECTION)
+        updated_since = datetime.fromisoformat(high_water) if high_water else None
+        if updated_since:
+            print(f"Fetching funkos updated since {high_water}")
+        else:
+            print("Fetching the full funkos collection")
+
+        started_at = int(time.time())
+
+        # 2. Stream funkos from Firebase page by page
+        from firestore_connection import FirestoreConnection
         connection = FirestoreConnection()  # Initializes Firebase connection
-        firebase_funkos = connection.get_all_funkos()  # Gets Funkos from Firestore
-    
-        # 3. Sync each Funko to firebase_funkos.db
-        for f in firebase_funkos:
-            FirebaseDB.upsert_funko(f.barcode, f.name, f.market_value, f.year)
-            print(f"✅ Synced Funko Pop: {f.name}")
+        if connection.db is None:
+            # FirestoreConnection only prints init failures; don't let them pass as an empty fetch
+            raise RuntimeError("Firestore is not available (see the error above); nothing was fetched")
+        firebase_funkos = connection.iter_funkos(page_size=page_size, updated_since=updated_since)
+
+        # 3. Upsert the Funkos into firebase_funkos.db, committing batch by batch
+        total = FirebaseDB.upsert_many(firebase_funkos, batch_size=batch_size, progress=progress)
+
+        # 4. The fetch completed (failures raise above): advance the high-water mark and
+        #    record the run together. top_movers() measures from the latest run, so a
+        #    failed or partial fetch must never record one.
+        with ConnectionManager.transaction(FirebaseDB.URL):
+            if total and connection.high_water_mark is not None:
+                FirebaseDB.set_high_water(SyncFirebase.COLLECTION, connection.high_water_mark.isoformat())
+            FirebaseDB.record_sync_run(SyncFirebase.COLLECTION, started_at, total)
 
         print("✅ Synced Firebase funkos into firebase_funkos.db")
-        print("Total funkos synced:", len(firebase_funkos))
+        print("Total funkos synced:", total)
         print("----- SyncFirebase.sync_firebase() completed successfully. -----")
+        return total
 
 if __name__ == "__main__":
-    sync_firebase()
+    import sys
+    SyncFirebase.sync_firebase(full="--full" in sys.argv)
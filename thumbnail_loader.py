@@ -0,0 +1,141 @@
+import os, sqlite3, traceback
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from PyQt5.QtGui import QImage
+
+from db_connection import ConnectionManager
+from image_store import ImageStore
+
+# On-disk thumbnail cache for pops whose image is not in the ImageStore yet
+# (image_path only). Thumbnails are stored as <content hash>_<size>.png,
+# so identical photos share one file. A small index maps each source path to its
+# (mtime, size, hash) so unchanged files are never re-read or re-hashed.
+class ThumbnailCache:
+    DIR = os.path.join(os.getcwd(), "thumbnails")
+    INDEX_PATH = os.path.join(DIR, "index.db")
+
+    @staticmethod
+    def create_table():
+        os.makedirs(ThumbnailCache.DIR, exist_ok=True)
+        sql = '''
+        CREATE TABLE IF NOT EXISTS thumbnail_index (
+            path TEXT PRIMARY KEY,
+            mtime REAL,
+            size INTEGER,
+            content_hash TEXT
+        );
+        '''
+        conn = ConnectionManager.get(ThumbnailCache.INDEX_PATH)
+        conn.execute(sql)
+
+    @staticmethod
+    def thumbnail_path(content_hash: str, size: int) -> str:
+        return os.path.join(ThumbnailCache.DIR, f"{content_hash}_{size}.png")
+
+    @staticmethod
+    def load(path: str, size: int) -> QImage:
+        """
+        Return a thumbnail no larger than size x size for the image at `path`,
+        from the cache when possible. Returns a null QImage if it cannot be read.
+        Safe to call from worker threads.
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return QImage()
+
+        conn = ConnectionManager.get(ThumbnailCache.INDEX_PATH)
+        row = conn.execute(
+            "SELECT mtime, size, content_hash FROM thumbnail_index WHERE path = ?", (path,)
+        ).fetchone()
+        if row and row[0] == stat.st_mtime and row[1] == stat.st_size:
+            cached = QImage(ThumbnailCache.thumbnail_path(row[2], size))
+            if not cached.isNull():
+                return cached
+
+        # Unknown or modified file: hash its contents (an identical photo may already be cached)
+        try:
+            content_hash = ImageStore.hash_file(path)
+        except OSError:
+            return QImage()
+        thumb_path = ThumbnailCache.thumbnail_path(content_hash, size)
+        image = QImage(thumb_path)
+        if image.isNull():
+            image = ImageStore.decode_scaled(path, size)
+            if image.isNull():
+                return image
+            image.save(thumb_path, "PNG")
+
+        try:
+            conn.execute('''
+                INSERT INTO thumbnail_index (path, mtime, size, content_hash) VALUES (?, ?, ?, ?)
+                ON CONFLICT(path) DO UPDATE SET
+                    mtime = excluded.mtime, size = excluded.size, content_hash = excluded.content_hash
+            ''', (path, stat.st_mtime, stat.st_size, content_hash))
+        except sqlite3.Error as e:
+            print("Error updating thumbnail index:", e)
+        return image
+
+
+# Loads one thumbnail on the thread pool: a stored rendition when the image has
+# a content hash, otherwise ThumbnailCache.load() of the original path
+class _ThumbnailJob(QRunnable):
+    def __init__(self, loader, key, size, content_hash):
+        super().__init__()
+        self.loader = loader
+        self.key = key
+        self.size = size
+        self.content_hash = content_hash
+
+    def run(self):
+        try:
+            if self.content_hash:
+                image = ImageStore.load_rendition(self.content_hash, self.size)
+            else:
+                image = ThumbnailCache.load(self.key, self.size)
+        except Exception:
+            # An exception escaping QRunnable.run() aborts the app; report a failed load instead
+            traceback.print_exc()
+            image = QImage()
+        finally:
+            # Pool threads retire after 30s idle; don't leave their index.db connections open
+            ConnectionManager.close_thread_connections()
+        # Emitting from the worker thread queues delivery onto the GUI thread
+        self.loader.thumbnailReady.emit(self.key, image)
+
+
+# Produces thumbnails off the GUI thread. Emits thumbnailReady(key, image) once per
+# request, where key is the content hash if one was given, else the path;
+# a null image means the file could not be loaded.
+class ThumbnailLoader(QObject):
+    thumbnailReady = pyqtSignal(str, QImage)
+
+    def __init__(self, size=80, parent=None):
+        super().__init__(parent)
+        self.size = size
+        self._pending = set()
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(max(2, QThreadPool.globalInstance().maxThreadCount() // 2))
+        self.thumbnailReady.connect(self._on_ready)
+        ThumbnailCache.create_table()
+
+    @staticmethod
+    def key_for(image_path, content_hash=None):
+        return content_hash or image_path
+
+    def request(self, image_path: str, content_hash: str = None) -> bool:
+        """Start loading a thumbnail. Returns False if that key is already being loaded."""
+        key = self.key_for(image_path, content_hash)
+        if key in self._pending:
+            return False
+        self._pending.add(key)
+        self._pool.start(_ThumbnailJob(self, key, self.size, content_hash))
+        return True
+
+    def shutdown(self, msecs=5000) -> bool:
+        """Drop queued loads and wait for running ones; call before ConnectionManager.close_all()."""
+        self._pool.clear()
+        return self._pool.waitForDone(msecs)
+
+    def _on_ready(self, key, image):
+        self._pending.discard(key)
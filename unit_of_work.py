@@ -0,0 +1,60 @@
+from typing import Dict
+
+from funko_pop import FunkoPop
+from funko_db import FunkoDB
+
+# Collects edits to many FunkoPops and saves them together. Only the fields that
+# actually changed are written, as column-level UPDATEs in one transaction.
+#
+#   with UnitOfWork() as session:
+#       for funko in session.track_all(FunkoDB.get_funkos_by_ids(ids)):
+#           funko.market_value = round(funko.market_value * 1.1, 2)
+#   # flushed here; nothing is written if the block raises
+class UnitOfWork:
+    def __init__(self):
+        self._funkos: Dict[int, FunkoPop] = {}   # id -> tracked FunkoPop
+
+    def track(self, funko: FunkoPop) -> FunkoPop:
+        """Include `funko` in the next flush. Returns it for chaining."""
+        if funko.id is None or funko.id < 0:
+            raise ValueError("Only saved Funkos (with an id) can be tracked; use FunkoDB.add_funko for new ones")
+        tracked = self._funkos.setdefault(funko.id, funko)
+        if tracked is not funko:
+            raise ValueError(f"Funko {funko.id} is already tracked through another object")
+        return funko
+
+    def track_all(self, funkos):
+        return [self.track(funko) for funko in funkos]
+
+    def pending(self) -> Dict[int, dict]:
+        """id -> {column: new value} for every tracked Funko with unsaved changes."""
+        pending = {}
+        for funko_id, funko in self._funkos.items():
+            changes = funko.dirty_fields()
+            if changes:
+                pending[funko_id] = changes
+        return pending
+
+    def flush(self) -> int:
+        """Write all pending changes in one transaction. Returns the number of rows changed."""
+        pending = self.pending()
+        if not pending:
+            return 0
+        changed = FunkoDB.update_fields(pending.items())
+        for funko_id in pending:
+            self._funkos[funko_id].mark_clean()
+        print(f"UnitOfWork flushed {sum(len(values) for values in pending.values())} fields on {changed} Funkos")
+        return changed
+
+    def clear(self):
+        """Stop tracking everything (unsaved changes stay on the objects)."""
+        self._funkos.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.flush()
+        self.clear()
+        return False